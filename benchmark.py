@@ -0,0 +1,383 @@
+import argparse
+import io
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from threading import Thread, Event
+import numpy as np
+from PIL import Image
+
+class SyntheticFrameGenerator:
+    """Writes numbered JPEG frames into a directory at a steady rate with random jitter"""
+    def __init__(self, directory, size, rate, jitter=0.0, start_index=0, variants=8, seed=0):
+        self.directory = directory
+        self.interval = 1.0 / rate
+        self.jitter = jitter
+        self.next_index = start_index
+        self.random = random.Random(seed)
+        # Encoded once, so the achieved rate does not depend on JPEG encoding speed
+        self.frames = [self._encode(size, i, variants) for i in range(variants)]
+        self.frames_written = 0
+        self.stop_event = Event()
+        self.thread = None
+
+    def _encode(self, size, variant, variants):
+        width, height = size
+        x = np.linspace(0, 255, width, dtype=np.float32)
+        y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+        phase = variant * 255 / variants
+        pixels = np.empty((height, width, 3), dtype=np.uint8)
+        pixels[..., 0] = (x + phase) % 256
+        pixels[..., 1] = (y + phase) % 256
+        pixels[..., 2] = (x[None, :] + y + 2 * phase) % 256
+        buffer = io.BytesIO()
+        Image.fromarray(pixels).save(buffer, 'JPEG', quality=90)
+        return buffer.getvalue()
+
+    def write_frame(self):
+        name = f"{self.next_index:09d}.jpg"
+        # Written under a temporary name and renamed into place, like a real generator
+        temp_path = os.path.join(self.directory, f".{name}.tmp")
+        with open(temp_path, 'wb') as f:
+            f.write(self.frames[self.next_index % len(self.frames)])
+        os.replace(temp_path, os.path.join(self.directory, name))
+        self.next_index += 1
+        self.frames_written += 1
+
+    def start(self, prefill=0):
+        """Write prefill frames immediately, then keep writing on a background thread"""
+        for _ in range(prefill):
+            self.write_frame()
+        self.thread = Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        deadline = time.perf_counter()
+        while not self.stop_event.is_set():
+            deadline += self.interval * (1 + self.random.uniform(-self.jitter, self.jitter))
+            remaining = deadline - time.perf_counter()
+            if remaining > 0 and self.stop_event.wait(remaining):
+                return
+            self.write_frame()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+def write_synthetic_overlay(path, size):
+    """Overlay with opaque bands at the top and bottom, a translucent frame and a transparent middle"""
+    width, height = size
+    pixels = np.zeros((height, width, 4), dtype=np.uint8)
+    band = height // 8
+    pixels[:band, :, :] = (20, 20, 20, 255)
+    pixels[-band:, :, :] = (20, 20, 20, 255)
+    pixels[band:band * 2, :, :] = (255, 255, 255, 96)
+    pixels[-band * 2:-band, :, :] = (255, 255, 255, 96)
+    Image.fromarray(pixels, 'RGBA').save(path)
+
+def summarize(values, scale=1.0):
+    """Mean, percentiles and maximum of values, multiplied by scale"""
+    if not values:
+        return {'count': 0}
+    ordered = sorted(values)
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] * scale
+    return {
+        'count': len(ordered),
+        'mean': sum(ordered) / len(ordered) * scale,
+        'p50': percentile(50),
+        'p95': percentile(95),
+        'p99': percentile(99),
+        'max': ordered[-1] * scale,
+    }
+
+def _peak_rss_mb(who):
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1024 ** 2 if sys.platform == 'darwin' else 1024)
+
+def _panning_frames(size, shift, count, seed=0):
+    """count frames of a smooth random texture panned by shift (dy, dx) pixels per frame"""
+    width, height = size
+    dy, dx = shift
+    margin_y = abs(dy) * count
+    margin_x = abs(dx) * count
+    rng = np.random.default_rng(seed)
+    coarse = rng.integers(0, 256, ((height + margin_y) // 16 + 2, (width + margin_x) // 16 + 2, 3), dtype=np.uint8)
+    texture = np.asarray(Image.fromarray(coarse).resize(
+        ((width + margin_x) + 32, (height + margin_y) + 32), Image.BILINEAR
+    ))
+    top = margin_y if dy < 0 else 0
+    left = margin_x if dx < 0 else 0
+    frames = []
+    for i in range(count):
+        y, x = top + i * dy, left + i * dx
+        frame = np.full((height, width, 4), 255, dtype=np.uint8)
+        frame[..., :3] = texture[y:y + height, x:x + width]
+        frames.append(frame)
+    return frames, texture, (top, left)
+
+# Pans per source frame; off the motion_scale grid, so they are only matched after refinement
+INTERPOLATION_PANS = ((2, 6), (3, 5), (1, -7))
+
+def _measure_pan(config, motion, frame_size, shift, pairs):
+    """Estimate and blend times and errors of both engines on one synthetic pan"""
+    width, height = frame_size
+    frames, texture, (top, left) = _panning_frames(frame_size, shift, pairs + 1)
+    steps = config.frames_to_interpolate + 1
+    out = np.empty_like(frames[0])
+
+    # Leave out the border a moved block cannot reach
+    my, mx = abs(shift[0]) + config.motion_block_size, abs(shift[1]) + config.motion_block_size
+    def error(pair, step):
+        y = top + round((pair + step / steps) * shift[0])
+        x = left + round((pair + step / steps) * shift[1])
+        exact = texture[y:y + height, x:x + width]
+        return float(np.abs(out[my:-my, mx:-mx, :3].astype(np.int16) - exact[my:-my, mx:-mx]).mean())
+
+    estimate_times = []
+    results = {'linear': {'times': [], 'errors': []}, 'motion': {'times': [], 'errors': []}}
+    for pair in range(pairs):
+        current, next = frames[pair], frames[pair + 1]
+        start = time.perf_counter()
+        vectors = motion.estimate(current, next)
+        estimate_times.append(time.perf_counter() - start)
+
+        for engine, engine_vectors in (('linear', None), ('motion', vectors)):
+            for step in range(1, steps):
+                start = time.perf_counter()
+                motion.blend(current, next, engine_vectors, step / steps, out)
+                results[engine]['times'].append(time.perf_counter() - start)
+                results[engine]['errors'].append(error(pair, step))
+    return estimate_times, results
+
+def run_interpolation_benchmark(config, frame_size=None, pairs=4, pans=INTERPOLATION_PANS):
+    """Time linear and motion-compensated interpolation per frame on synthetic camera pans"""
+    from motion_interpolation import MotionInterpolator
+
+    frame_size = frame_size or config.final_resolution_model
+    steps = config.frames_to_interpolate + 1
+    motion = MotionInterpolator(
+        frame_size, config.motion_block_size, config.motion_scale, config.motion_search, config.decode_workers
+    )
+
+    estimate_times = []
+    times = {'linear': [], 'motion': []}
+    errors = {}
+    try:
+        for shift in pans:
+            pan_estimates, results = _measure_pan(config, motion, frame_size, shift, pairs)
+            estimate_times += pan_estimates
+            for engine, result in results.items():
+                times[engine] += result['times']
+            errors[f"{shift[0]},{shift[1]}"] = {
+                engine: sum(result['errors']) / len(result['errors']) for engine, result in results.items()
+            }
+    finally:
+        motion.shutdown()
+
+    # Estimation runs once per source frame and is shared by its interpolated frames
+    estimate_share = [t / (steps - 1) for t in estimate_times]
+    return {
+        'config': {
+            'frame_size': list(frame_size),
+            'frames_to_interpolate': config.frames_to_interpolate,
+            'motion_block_size': config.motion_block_size,
+            'motion_scale': config.motion_scale,
+            'motion_search': config.motion_search,
+            'workers': config.decode_workers,
+            'pans_per_frame': [list(shift) for shift in pans],
+        },
+        'pairs': pairs,
+        'estimate_ms': summarize(estimate_times, 1000),
+        'linear': {
+            'blend_ms': summarize(times['linear'], 1000),
+        },
+        'motion': {
+            'blend_ms': summarize(times['motion'], 1000),
+            'per_frame_ms': 1000 * (sum(times['motion']) + sum(estimate_times)) / len(times['motion']),
+            'estimate_share_ms': summarize(estimate_share, 1000),
+        },
+        # Mean error of each engine per pan, keyed by "dy,dx"
+        'mean_error': errors,
+    }
+
+def run_benchmark(config, duration, rate, jitter, frame_size=None):
+    """Play a synthetic sequence headlessly for duration seconds and return the report as a dict"""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    from main import Application
+
+    class BenchmarkApplication(Application):
+        """Application that records per-tick and per-frame timings and stops after duration"""
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.start_time = None
+            self.frame_times = []
+            self.decode_times = []
+            self.upload_times = []
+            self.queue_depths = []
+            self.source_frames = 0
+            self.ticks = 0
+            self.texture_snapshot = None
+
+        def _take_next_frame(self):
+            start = time.perf_counter()
+            result = super()._take_next_frame()
+            if self.start_time is not None:
+                self.upload_times.append(time.perf_counter() - start)
+                self.decode_times.append(self.sequence_player.last_decode_time)
+                self.source_frames += 1
+            return result
+
+        def _handle_image_sequence(self, current_time):
+            if self.start_time is None:
+                self.start_time = current_time
+            elif self.stats.frame_times:
+                self.frame_times.append(self.stats.frame_times[-1])
+            super()._handle_image_sequence(current_time)
+
+            self.ticks += 1
+            self.queue_depths.append((
+                round(current_time - self.start_time, 3),
+                self.sequence_player.frame_buffer.qsize()
+            ))
+            if current_time - self.start_time >= duration:
+                self.running = False
+
+        def _cleanup(self):
+            self.texture_snapshot = self.textures.snapshot()
+            super()._cleanup()
+
+    frame_size = frame_size or config.final_resolution_model
+    with tempfile.TemporaryDirectory(prefix='sequence-benchmark-') as root:
+        image_directory = os.path.join(root, 'frames')
+        os.makedirs(image_directory)
+        overlay_path = os.path.join(root, 'overlay.png')
+        write_synthetic_overlay(overlay_path, config.final_resolution)
+
+        # One image-only sequence: the video trigger is never reached
+        config.sequences = [{
+            'id': 'benchmark',
+            'image_directory': image_directory,
+            'overlay_path': overlay_path,
+            'video_path': os.path.join(root, 'missing.mp4'),
+        }]
+        config.current_sequence_index = 0
+        config.video_trigger_time = float('inf')
+        config.video_trigger_frame = float('inf')
+
+        generator = SyntheticFrameGenerator(
+            image_directory, frame_size, rate, jitter, config.sequence_start_frame
+        )
+        generator.start(prefill=2)
+
+        wall_start = time.perf_counter()
+        app = BenchmarkApplication(0, config, software_renderer=True)
+        try:
+            app.run()
+        finally:
+            generator.stop()
+        wall_time = time.perf_counter() - wall_start
+
+    elapsed = max(app.queue_depths[-1][0] if app.queue_depths else 0.0, 1e-6)
+    depths = [depth for _, depth in app.queue_depths]
+    return {
+        'config': {
+            'decode_preset': config.decode_preset,
+            'resampling': config.resampling,
+            'interpolation_mode': config.interpolation_mode,
+            # The backend that actually ran; 'auto' picks 'cpu' on the dummy driver's software renderer
+            'compositing': 'cpu' if app.cpu_compositor else 'gpu',
+            'interpolation_engine': config.interpolation_engine,
+            'decode_workers': config.decode_workers,
+            'buffer_size': config.buffer_size,
+            'source_fps': config.source_fps,
+            'total_fps': config.total_fps,
+            'frame_size': list(frame_size),
+            'generator_rate': rate,
+            'generator_jitter': jitter,
+        },
+        'duration': elapsed,
+        'wall_time': wall_time,
+        'frames_generated': generator.frames_written,
+        'source_frames': app.source_frames,
+        'display_frames': app.ticks,
+        'source_fps': app.source_frames / elapsed,
+        'display_fps': app.ticks / elapsed,
+        'late_frames': app.stats.late_frames,
+        'dropped_frames': app.stats.dropped_frames,
+        'frame_time_ms': summarize(app.frame_times, 1000),
+        'decode_ms': summarize(app.decode_times, 1000),
+        'upload_ms': summarize(app.upload_times, 1000),
+        'queue_depth': {
+            'capacity': config.buffer_size,
+            'mean': sum(depths) / max(len(depths), 1),
+            'min': min(depths, default=0),
+            'max': max(depths, default=0),
+            'timeline': app.queue_depths,
+        },
+        'textures': app.texture_snapshot,
+        'peak_rss_mb': {
+            'main': _peak_rss_mb(resource.RUSAGE_SELF),
+            'decode_workers': _peak_rss_mb(resource.RUSAGE_CHILDREN),
+        },
+    }
+
+def benchmark_main(argv=None):
+    from config import Config
+
+    config = Config()
+    parser = argparse.ArgumentParser(prog='main.py --benchmark',
+                                     description='Headless end-to-end playback benchmark with synthetic frames')
+    parser.add_argument('--duration', type=float, default=30.0,
+                      help='Seconds of playback to measure')
+    parser.add_argument('--rate', type=float, default=config.source_fps,
+                      help='Frames per second written by the synthetic generator')
+    parser.add_argument('--jitter', type=float, default=0.2,
+                      help='Relative random variation of the generator interval (0 to 1)')
+    parser.add_argument('--frame-size', type=int, nargs=2, metavar=('WIDTH', 'HEIGHT'),
+                      help='Size of the generated frames (defaults to the model resolution)')
+    parser.add_argument('--preset', choices=('quality', 'speed'), default=config.decode_preset,
+                      help='Decode preset')
+    parser.add_argument('--resampling', choices=('lanczos', 'bicubic', 'bilinear', 'nearest'),
+                      default=config.resampling, help='Resampling tier')
+    parser.add_argument('--interpolation', choices=('present', 'prerendered'),
+                      default=config.interpolation_mode, help='Interpolation mode')
+    parser.add_argument('--compositing', choices=('auto', 'gpu', 'cpu'), default=config.compositing,
+                      help="Compositing backend ('auto' picks 'cpu' on the headless software renderer)")
+    parser.add_argument('--engine', choices=('linear', 'motion'), default=config.interpolation_engine,
+                      help='Interpolation engine')
+    parser.add_argument('--workers', type=int, default=config.decode_workers,
+                      help='Decode worker processes')
+    parser.add_argument('--interpolation-cost', action='store_true',
+                      help='Only measure the cost per interpolated frame of each engine on a synthetic pan')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    args = parser.parse_args(argv)
+
+    config.decode_preset = args.preset
+    config.resampling = args.resampling
+    config.interpolation_mode = args.interpolation
+    config.decode_workers = args.workers
+    config.interpolation_engine = args.engine
+    config.compositing = args.compositing
+
+    if args.interpolation_cost:
+        report = run_interpolation_benchmark(config, args.frame_size)
+    else:
+        report = run_benchmark(config, args.duration, args.rate, args.jitter, args.frame_size)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+        print(f"Benchmark report written to {args.output}")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    benchmark_main()
@@ -1,3 +1,5 @@
+import os
+
 class Config:
     """Configuration class storing all constants and settings"""
     def __init__(self):
@@ -39,16 +41,85 @@ class Config:
         self.frames_to_interpolate = 4
         self.total_fps = self.source_fps * (self.frames_to_interpolate + 1)
 
+        # The loader fills the frame buffer as fast as frames decode whenever it holds
+        # prefetch_low_water frames or fewer, until it reaches prefetch_high_water
+        self.prefetch_low_water = 2
+        self.prefetch_high_water = self.buffer_size
+
+        # 'present' blends the current and next frame on the backbuffer every display tick,
+        # 'prerendered' renders frames_to_interpolate blend textures per source frame
+        self.interpolation_mode = 'present'
+        self.crossfade_duration = 1.0 / self.source_fps  # seconds per 'present' crossfade
+
+        # 'gpu' composites with SDL render copies, 'cpu' with fixed-point NumPy, and 'auto'
+        # picks 'cpu' when SDL falls back to its software renderer
+        self.compositing = 'auto'
+
+        # 'linear' crossfades source frames, 'motion' warps them along block motion vectors
+        # before blending, so fewer source frames move smoothly: halve source_fps and raise
+        # frames_to_interpolate to 2 * frames_to_interpolate + 1 for the same total_fps.
+        # 'motion' composites on the CPU.
+        self.interpolation_engine = 'linear'
+        self.motion_block_size = 32  # pixels per side of a motion block
+        self.motion_scale = 4  # downscale factor for motion estimation
+        self.motion_search = 4  # search range in downscaled pixels
+
+        # Worker processes decoding source frames (0 decodes on the loader thread)
+        self.decode_workers = max(1, (os.cpu_count() or 2) - 1)
+        # Streaming textures source frames are uploaded into (current, next and spares)
+        self.texture_ring_size = 4
+
+        # Resampling tier for decoded frames: 'lanczos', 'bicubic', 'bilinear' or 'nearest'.
+        # A sequence can override it with its own 'resampling' entry.
+        self.resampling = 'lanczos'
+        # 'quality' keeps the tier and oversamples JPEG draft decoding, 'speed' trades quality for decode time
+        self.decode_preset = 'quality'
+
+        # Opt-in on-disk cache of display-ready frames, e.g. 'results/frame_cache/' (None disables it)
+        self.frame_cache_directory = None
+        self.frame_cache_budget = 32 * 1024 ** 3  # bytes
+        # The first buffer_size decoded frames of every sequence kept in RAM across sequence
+        # cycles, so a restart does not wait for decode (0 disables it). 1 GiB holds the
+        # opening frames of four sequences at the model resolution.
+        self.memory_cache_budget = 1024 ** 3  # bytes
+        # Overlay textures of all sequences kept resident by OverlayCache
+        self.overlay_cache_budget = 256 * 1024 * 1024  # bytes
+
+        # Record the full creation stack of every texture and print leaked textures with it at sequence boundaries
+        self.texture_debug = False
+
+        # Rolling-window pacing metrics: served in Prometheus text format at
+        # http://127.0.0.1:<metrics_port>/metrics and/or appended to metrics_jsonl_path
+        # every metrics_interval seconds (None disables either)
+        self.metrics_port = None
+        self.metrics_jsonl_path = None
+        self.metrics_interval = 10.0  # seconds
+        self.metrics_window = 1200  # observations kept per histogram
+        # Overlays are drawn per tile so transparent tiles are skipped and opaque ones copied without blending
+        self.overlay_tile_size = 128
+        # Upper bound on idle render targets kept for reuse by TextureManager
+        self.texture_pool_limit = 256 * 1024 * 1024
+
         self.sequence_start_frame = 50  # initial frame number to begin playback from
 
         # Video starts at frame 200 OR after 15 seconds
         self.video_trigger_frame = 200  # Frame to start video
         self.video_trigger_time = 5.0  # Time (seconds) to start video
         self.fade_duration = 2.0
+        self.video_queue_size = 8  # decoded video frames buffered ahead of the render thread
+        # Frames of the next sequence decoded while the video plays (0 waits until it ends)
+        self.next_sequence_prefetch = 4
 
     def get_current_sequence(self):
         return self.sequences[self.current_sequence_index]
 
+    def get_resampling(self, sequence=None):
+        sequence = sequence or self.get_current_sequence()
+        return sequence.get('resampling', self.resampling)
+
+    def peek_next_sequence(self):
+        return self.sequences[(self.current_sequence_index + 1) % len(self.sequences)]
+
     def next_sequence(self):
         self.current_sequence_index = (self.current_sequence_index + 1) % len(self.sequences)
         return self.get_current_sequence()
\ No newline at end of file
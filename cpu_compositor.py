@@ -0,0 +1,353 @@
+import ctypes
+import time
+from queue import Queue, Empty
+from threading import Thread
+import numpy as np
+import sdl2
+
+# Sets of prepared motion blends: one on screen, one ready and one being computed
+MOTION_PREPARED_SETS = 3
+# Source frame copies waiting for or in use by the motion worker
+MOTION_SOURCE_FRAMES = 4
+# Seconds take_prepared waits for the motion worker before giving up
+MOTION_PREPARED_TIMEOUT = 30.0
+
+def is_software_renderer(renderer):
+    """True when SDL reports that renderer draws in software"""
+    info = sdl2.SDL_RendererInfo()
+    if sdl2.SDL_GetRendererInfo(renderer, ctypes.byref(info)) != 0:
+        return False
+    return bool(info.flags & sdl2.SDL_RENDERER_SOFTWARE)
+
+def _divide_by_255(values):
+    """Round uint16 values in place to values / 255 without leaving 16 bits"""
+    np.add(values, 128, out=values)
+    np.add(values, values >> 8, out=values)
+    np.right_shift(values, 8, out=values)
+    return values
+
+class _PreparedBlends:
+    """One composited source frame and the motion blends leading up to it"""
+    def __init__(self, shape, frames_to_interpolate):
+        self.frame = np.zeros(shape, dtype=np.uint8)
+        self.blends = np.zeros((frames_to_interpolate,) + shape, dtype=np.uint8)
+        self.count = 0  # blends filled in, 0 for the first frame of a generation
+        self.generation = None
+
+class CpuCompositor:
+    """Fixed-point NumPy compositing for renderers without a usable GPU"""
+    def __init__(self, renderer, texture_manager, image_rect, frames_to_interpolate, band_rows=16, motion=None,
+                 weights=None):
+        self.renderer = renderer
+        self.texture_manager = texture_manager
+        self.image_rect = image_rect
+        self.band_rows = band_rows
+        width, height = image_rect.w, image_rect.h
+        shape = (height, width, 4)
+
+        self.current = np.zeros(shape, dtype=np.uint8)
+        self.next = np.zeros(shape, dtype=np.uint8)
+        self.faded = np.zeros(shape, dtype=np.uint8)
+
+        self.motion = motion
+        if motion:
+            # A worker thread estimates, warps and composites ahead of display; the render thread only uploads
+            steps = frames_to_interpolate + 1
+            self.times = [i / steps for i in range(1, steps)]
+            self.weights = list(weights) if weights is not None else self.times
+            self.warped = np.zeros(shape, dtype=np.uint8)
+            self.generation = 0
+            self.free_sources = Queue()
+            for _ in range(MOTION_SOURCE_FRAMES):
+                self.free_sources.put(np.zeros(shape, dtype=np.uint8))
+            self.free_prepared = Queue()
+            for _ in range(MOTION_PREPARED_SETS):
+                self.free_prepared.put(_PreparedBlends(shape, frames_to_interpolate))
+            self.sources = Queue()  # (generation, source frame) for the worker, None stops it
+            self.prepared = Queue()  # finished _PreparedBlends in order
+            self.shown = None  # _PreparedBlends whose blends are on screen
+            self.uploaded = 0  # blends of shown uploaded so far
+            self.error = None  # exception that stopped the worker
+        else:
+            self.blends = np.zeros((frames_to_interpolate,) + shape, dtype=np.uint8)
+            self.band_batch = np.zeros((frames_to_interpolate, band_rows, width, 4), dtype=np.int16)
+
+        self.band = np.zeros((band_rows, width, 4), dtype=np.uint16)
+        self.band_difference = np.zeros((band_rows, width, 4), dtype=np.int16)
+
+        # Overlay inside the image rect: premultiplied colour (alpha channel as white) and 255 - alpha
+        self.overlay_premultiplied = np.zeros(shape, dtype=np.uint16)
+        self.overlay_inverse = np.full((height, width, 1), 255, dtype=np.uint16)
+        self.overlay_bands = []  # True for each band of rows the overlay covers at all
+        self.background = None  # overlay over black for the whole screen, drawn unblended
+
+        self.current_texture = self._create_texture()
+        self.next_texture = self._create_texture()
+        self.blend_textures = [self._create_texture() for _ in range(frames_to_interpolate)]
+        self.fade_texture = self._create_texture()
+
+        if motion:
+            self.worker = Thread(target=self._prepare_loop, daemon=True, name='motion-prepare')
+            self.worker.start()
+
+    def _create_texture(self):
+        texture = self.texture_manager.acquire_texture(
+            self.image_rect.w,
+            self.image_rect.h,
+            sdl2.SDL_PIXELFORMAT_RGBA32,
+            sdl2.SDL_TEXTUREACCESS_STREAMING,
+            'compositor'
+        )
+        if texture:
+            sdl2.SDL_SetTextureBlendMode(texture, sdl2.SDL_BLENDMODE_NONE)
+        return texture
+
+    def _upload(self, texture, pixels):
+        if sdl2.SDL_UpdateTexture(texture, None, pixels.ctypes.data, pixels.strides[0]) != 0:
+            print(f"Failed to upload composited frame: {sdl2.SDL_GetError()}")
+
+    def _bands(self):
+        for start in range(0, self.image_rect.h, self.band_rows):
+            yield start, min(start + self.band_rows, self.image_rect.h)
+
+    def set_overlay(self, image):
+        """Prepare the overlay, a screen-sized RGBA PIL image or None for no overlay, for compositing"""
+        # Frames prepared with the previous overlay are dropped
+        if self.motion:
+            self._start_generation()
+        if self.background:
+            self.texture_manager.destroy_texture(self.background)
+            self.background = None
+        if image is None:
+            self.overlay_premultiplied.fill(0)
+            self.overlay_inverse.fill(255)
+            self.overlay_bands = [False for _ in self._bands()]
+            return
+
+        overlay = np.asarray(image.convert('RGBA'))
+        rect = self.image_rect
+        region = overlay[rect.y:rect.y + rect.h, rect.x:rect.x + rect.w]
+        alpha = region[..., 3:].astype(np.uint16)
+
+        np.multiply(region, alpha, out=self.overlay_premultiplied, casting='unsafe')
+        self.overlay_premultiplied[..., 3] = 255 * alpha[..., 0]
+        np.subtract(255, alpha, out=self.overlay_inverse)
+        self.overlay_bands = [bool(alpha[start:end].any()) for start, end in self._bands()]
+
+        background = overlay[..., :3].astype(np.uint16) * overlay[..., 3:]
+        background = _divide_by_255(background).astype(np.uint8)
+        self.background = self._texture_from_rgb(background)
+
+    def _texture_from_rgb(self, pixels):
+        height, width = pixels.shape[:2]
+        texture = self.texture_manager.registry.create(
+            self.renderer,
+            sdl2.SDL_PIXELFORMAT_RGB24,
+            sdl2.SDL_TEXTUREACCESS_STATIC,
+            width,
+            height,
+            'compositor'
+        )
+        if not texture:
+            print(f"Failed to create overlay background: {sdl2.SDL_GetError()}")
+            return None
+        self._upload(texture, np.ascontiguousarray(pixels))
+        sdl2.SDL_SetTextureBlendMode(texture, sdl2.SDL_BLENDMODE_NONE)
+        return texture
+
+    def load_next(self, pixels):
+        """Composite the overlay over a decoded (height, width, 4) source frame into the next frame"""
+        # With motion the frame is queued for the worker instead; callers check accepts_frame first
+        if self.motion:
+            self._check_worker()
+            source = self.free_sources.get()
+            np.copyto(source, pixels)
+            self.sources.put((self.generation, source))
+            return
+        self._composite(pixels, self.next)
+
+    def _composite(self, pixels, out):
+        for (start, end), covered in zip(self._bands(), self.overlay_bands):
+            if not covered:
+                out[start:end] = pixels[start:end]
+                continue
+            band = self.band[:end - start]
+            np.multiply(pixels[start:end], self.overlay_inverse[start:end], out=band, casting='unsafe')
+            np.add(band, self.overlay_premultiplied[start:end], out=band)
+            np.copyto(out[start:end], _divide_by_255(band), casting='unsafe')
+
+    def interpolate(self, weights):
+        """Blend current toward next at each weight in one batch and upload the results and next"""
+        # The overlay was composited into current and next on arrival; blending over it is affine,
+        # so crossfading the composited frames equals compositing a crossfade
+        count = len(weights)
+        if count:
+            # current + (next - current) * weight with 7-bit weights, which keeps the products within int16
+            next_weights = np.array([round(w * 128) for w in weights], dtype=np.int16).reshape(count, 1, 1, 1)
+
+            for start, end in self._bands():
+                rows = end - start
+                difference = self.band_difference[:rows]
+                batch = self.band_batch[:count, :rows]
+                np.subtract(self.next[start:end], self.current[start:end], out=difference, dtype=np.int16)
+                np.multiply(difference, next_weights, out=batch)
+                np.add(batch, 64, out=batch)
+                np.right_shift(batch, 7, out=batch)
+                np.add(batch, self.current[start:end], out=batch, casting='unsafe')
+                np.copyto(self.blends[:count, start:end], batch, casting='unsafe')
+
+        for texture, pixels in zip(self.blend_textures, self.blends[:count]):
+            self._upload(texture, pixels)
+        self._upload(self.next_texture, self.next)
+
+    def accepts_frame(self):
+        """True if the motion worker has room for another source frame"""
+        return not self.free_sources.empty()
+
+    def prepared_ready(self):
+        """True if take_prepared would not wait, dropping sets of older generations"""
+        self._check_worker()
+        while not self.prepared.empty():
+            prepared = self.prepared.queue[0]
+            if prepared.generation == self.generation:
+                return True
+            self.free_prepared.put(self.prepared.get())
+        return False
+
+    def take_prepared(self, timeout=MOTION_PREPARED_TIMEOUT):
+        """Wait for the motion worker's next frame and upload it as next, with its blends shown by draw"""
+        deadline = time.perf_counter() + timeout
+        while True:
+            self._check_worker()
+            try:
+                prepared = self.prepared.get(timeout=0.1)
+            except Empty:
+                if time.perf_counter() >= deadline:
+                    raise TimeoutError(f"Motion interpolation prepared no frame within {timeout:.0f} s")
+                continue
+            if prepared.generation == self.generation:
+                break
+            self.free_prepared.put(prepared)
+
+        self._release_shown()
+        self.shown = prepared
+        self.uploaded = 0
+        np.copyto(self.next, prepared.frame)
+        self._upload(self.next_texture, self.next)
+
+    def _check_worker(self):
+        if self.error:
+            raise RuntimeError(f"Motion interpolation stopped: {self.error}") from self.error
+
+    def _release_shown(self):
+        if self.shown is not None:
+            self.free_prepared.put(self.shown)
+            self.shown = None
+
+    def _start_generation(self):
+        """Drop the motion worker's queued frames and everything prepared from them"""
+        self.generation += 1
+        self._release_shown()
+        while True:
+            try:
+                item = self.sources.get_nowait()
+            except Empty:
+                break
+            self.free_sources.put(item[1])
+        self.prepared_ready()
+
+    def _prepare_loop(self):
+        previous, previous_generation = None, None
+        while True:
+            item = self.sources.get()
+            if item is None:
+                return
+            generation, source = item
+            if previous is not None and (previous_generation != generation or generation != self.generation):
+                self.free_sources.put(previous)
+                previous = None
+            if generation != self.generation:
+                self.free_sources.put(source)
+                continue
+
+            prepared = self.free_prepared.get()
+            try:
+                self._prepare(previous, source, prepared)
+            except Exception as e:
+                # Raised on the render thread by the next load_next, prepared_ready or take_prepared
+                print(f"Motion interpolation failed: {e}")
+                self.error = e
+                self.free_prepared.put(prepared)
+                return
+            prepared.generation = generation
+            self.prepared.put(prepared)
+            if previous is not None:
+                self.free_sources.put(previous)
+            previous, previous_generation = source, generation
+
+    def _prepare(self, previous, source, prepared):
+        prepared.count = 0
+        if previous is not None:
+            try:
+                self._blend_motion(previous, source, prepared.blends, self.motion.estimate(previous, source))
+            except Exception as e:
+                print(f"Motion estimation failed, crossfading instead: {e}")
+                self._blend_motion(previous, source, prepared.blends, None)
+            prepared.count = len(self.times)
+        self._composite(source, prepared.frame)
+
+    def _blend_motion(self, previous, source, blends, vectors):
+        for t, weight, blend in zip(self.times, self.weights, blends):
+            self.motion.blend(previous, source, vectors, t, self.warped, weight)
+            self._composite(self.warped, blend)
+
+    def promote(self):
+        """Make the next frame the current one"""
+        self.current, self.next = self.next, self.current
+        self.current_texture, self.next_texture = self.next_texture, self.current_texture
+
+    def show(self, texture):
+        if self.background:
+            sdl2.SDL_RenderCopy(self.renderer, self.background, None, None)
+        sdl2.SDL_RenderCopy(self.renderer, texture, None, self.image_rect)
+
+    def draw(self, step):
+        """Draw the current frame for step 0, otherwise the step-th blend toward the next frame"""
+        if self.motion and self.shown is not None:
+            # Prepared blends are uploaded as they are first drawn, one per tick
+            while self.uploaded < min(step, self.shown.count):
+                self._upload(self.blend_textures[self.uploaded], self.shown.blends[self.uploaded])
+                self.uploaded += 1
+        self.show(self.current_texture if step == 0 else self.blend_textures[step - 1])
+
+    def render_fade(self, alpha, white_rows):
+        """Draw the current frame faded by alpha (0-255) toward white inside white_rows and black elsewhere"""
+        if alpha == 0:
+            self.show(self.current_texture)
+            return
+
+        levels = np.arange(256, dtype=np.uint16) * (255 - alpha)
+        to_black = _divide_by_255(levels.copy()).astype(np.uint8)
+        to_white = _divide_by_255(levels + 255 * alpha).astype(np.uint8)
+
+        top, bottom = white_rows
+        np.take(to_black, self.current[:top], out=self.faded[:top])
+        np.take(to_white, self.current[top:bottom], out=self.faded[top:bottom])
+        np.take(to_black, self.current[bottom:], out=self.faded[bottom:])
+        self._upload(self.fade_texture, self.faded)
+        self.show(self.fade_texture)
+
+    def destroy(self):
+        for texture in [self.current_texture, self.next_texture, self.fade_texture] + self.blend_textures:
+            if texture:
+                self.texture_manager.release_texture(texture)
+        self.blend_textures = []
+        self.current_texture = self.next_texture = self.fade_texture = None
+        if self.background:
+            self.texture_manager.destroy_texture(self.background)
+            self.background = None
+        if self.motion:
+            self._start_generation()
+            self.sources.put(None)
+            self.worker.join()
+            self.motion.shutdown()
@@ -0,0 +1,122 @@
+import ctypes
+import os
+import re
+import select
+import struct
+import time
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+class DirectoryWatcher:
+    """Waits for files to be completely written into a directory, through inotify or polling"""
+    def __init__(self, directory, poll_interval=0.02, settle_time=0.25, pattern=None):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self.settle_time = settle_time
+        self.pattern = re.compile(pattern) if pattern else None  # names to record, e.g. not temp files
+        self.completed = set()
+        self.observed = {}  # path -> ((size, mtime_ns), time first seen with them)
+        self.fd = None
+        self._init_inotify()
+
+    def _init_inotify(self):
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return
+        if fd < 0:
+            return
+
+        if libc.inotify_add_watch(fd, os.fsencode(self.directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            print(f"inotify unavailable for {self.directory} ({os.strerror(ctypes.get_errno())}), polling instead")
+            os.close(fd)
+            return
+
+        self.fd = fd
+
+    def _drain_events(self):
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + name_len].rstrip(b'\0')
+            offset += name_len
+            if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                name = os.fsdecode(name)
+                if self.pattern is None or self.pattern.fullmatch(name):
+                    self.completed.add(name)
+
+    def is_ready(self, filename):
+        """True if filename exists in the directory and has been completely written"""
+        if self.fd is not None:
+            self._drain_events()
+            if filename in self.completed:
+                return True
+        return self._looks_complete(os.path.join(self.directory, filename))
+
+    def _looks_complete(self, path):
+        # Complete once a JPEG ends with the end-of-image marker, or has settled: JPEGs with
+        # trailing padding or metadata never end with the marker
+        try:
+            with open(path, 'rb') as f:
+                if not path.lower().endswith(('.jpg', '.jpeg')):
+                    return True
+                f.seek(0, os.SEEK_END)
+                if f.tell() >= 4:
+                    f.seek(-2, os.SEEK_END)
+                    if f.read(2) == b'\xff\xd9':
+                        self.observed.pop(path, None)
+                        return True
+                return self._settled(path, os.fstat(f.fileno()))
+        except OSError:
+            return False
+
+    def _settled(self, path, stat):
+        """True once the file has kept its size and mtime for settle_time seconds"""
+        signature = (stat.st_size, stat.st_mtime_ns)
+        now = time.perf_counter()
+        previous = self.observed.get(path)
+        if previous is None or previous[0] != signature:
+            self.observed[path] = (signature, now)
+            return False
+        if stat.st_size >= 4 and now - previous[1] >= self.settle_time:
+            del self.observed[path]
+            return True
+        return False
+
+    def wait_for(self, filename, timeout):
+        """Block until filename is ready or timeout seconds pass, returning whether it is ready"""
+        deadline = time.perf_counter() + timeout
+
+        while not self.is_ready(filename):
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return False
+            if self.fd is not None:
+                # Also wake up to notice files that settle without a further event
+                select.select([self.fd], [], [], min(remaining, self.settle_time))
+            else:
+                time.sleep(min(self.poll_interval, remaining))
+
+        return True
+
+    def forget(self, filename):
+        """Drop filename and every name sorting before it, which are never asked for again"""
+        self.completed = {name for name in self.completed if name > filename}
+        self.observed.pop(os.path.join(self.directory, filename), None)
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
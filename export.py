@@ -0,0 +1,179 @@
+import argparse
+import ctypes
+import os
+import time
+from fractions import Fraction
+from queue import Queue
+from threading import Thread
+import av
+import numpy as np
+import sdl2
+from playback_stats import PlaybackStatistics
+
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.mkv')
+
+class SimulatedClock:
+    """Stand-in for FrameScheduler that advances one frame interval per tick without sleeping"""
+    def __init__(self, fps, start):
+        self.interval = 1.0 / fps
+        self.start = start
+        self.frame_number = 0
+
+    def reset(self):
+        pass
+
+    def wait(self, on_event=None):
+        now = self.start + self.frame_number * self.interval
+        self.frame_number += 1
+        return now, False, 0
+
+    def elapsed(self):
+        return self.frame_number * self.interval
+
+class FrameWriter:
+    """Encodes RGBA frames with PyAV into a video file or a numbered PNG sequence in a directory"""
+    def __init__(self, path, size, fps, crf=18, queue_size=4):
+        if path.lower().endswith(VIDEO_EXTENSIONS):
+            self.container = av.open(path, 'w')
+            self.stream = self.container.add_stream('libx264', rate=fps)
+            self.stream.pix_fmt = 'yuv420p'
+            self.stream.options = {'crf': str(crf), 'preset': 'veryfast'}
+        else:
+            os.makedirs(path, exist_ok=True)
+            self.container = av.open(os.path.join(path, 'frame_%06d.png'), 'w', format='image2')
+            self.stream = self.container.add_stream('png', rate=fps)
+            self.stream.pix_fmt = 'rgb24'
+        self.stream.width, self.stream.height = size
+        self.stream.time_base = Fraction(1, fps)
+        self.frames_written = 0
+        self.error = None
+        # Colour conversion and encoding on a writer thread overlap with rendering the next frames
+        self.queue = Queue(maxsize=queue_size)
+        self.thread = Thread(target=self._encode_loop, daemon=True)
+        self.thread.start()
+
+    def write(self, pixels):
+        """Queue a copy of an RGBA frame, blocking while the encoder is queue_size frames behind"""
+        if self.error:
+            raise self.error
+        self.queue.put(pixels.copy())
+        self.frames_written += 1
+
+    def _encode_loop(self):
+        pts = 0
+        while True:
+            pixels = self.queue.get()
+            if pixels is None:
+                return
+            if self.error:
+                continue
+            try:
+                frame = av.VideoFrame.from_ndarray(pixels, format='rgba').reformat(format=self.stream.pix_fmt)
+                frame.pts = pts
+                self.container.mux(self.stream.encode(frame))
+                pts += 1
+            except Exception as e:
+                self.error = e
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+        if not self.error:
+            self.container.mux(self.stream.encode(None))
+        self.container.close()
+        if self.error:
+            raise self.error
+
+def render_show(config, output, size=(1920, 1080), duration=None):
+    """Render the show on a simulated clock into output, returning a throughput report"""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    from main import Application
+
+    # The output is usually below the logical resolution, where SDL's scaled copies
+    # are cheaper than compositing full-size frames on the CPU
+    if config.compositing == 'auto':
+        config.compositing = 'gpu'
+
+    class ExportApplication(Application):
+        """Application driven by a simulated clock that reads back every composited frame"""
+        def __init__(self, writer):
+            super().__init__(0, config, software_renderer=True)
+            self.writer = writer
+            self.hud.visible = False
+            self.decode_wait = 10.0
+            self.sequences_played = 0
+            self.readback = np.empty((size[1], size[0], 4), dtype=np.uint8)
+
+            window = self.sdl_app.window
+            sdl2.SDL_SetWindowFullscreen(window, 0)
+            sdl2.SDL_SetWindowSize(window, size[0], size[1])
+            self.handle_events()
+
+        def _initialize(self):
+            super()._initialize()
+            start = time.perf_counter()
+            self.scheduler = SimulatedClock(config.total_fps, start)
+            self.stats = PlaybackStatistics(start)
+
+        def _present(self):
+            if sdl2.SDL_RenderReadPixels(
+                self.sdl_app.renderer,
+                None,
+                sdl2.SDL_PIXELFORMAT_RGBA32,
+                self.readback.ctypes.data_as(ctypes.c_void_p),
+                size[0] * 4
+            ) != 0:
+                raise RuntimeError(f"Failed to read back frame: {sdl2.SDL_GetError()}")
+            self.writer.write(self.readback)
+            super()._present()
+
+            if duration is not None and self.scheduler.elapsed() >= duration:
+                self.running = False
+
+        def _reset_sequence_with_transition(self, white_transition, current_time):
+            super()._reset_sequence_with_transition(white_transition, current_time)
+            self.sequences_played += 1
+            # Without a duration, stop once every sequence has played and the show is back at the first
+            if duration is None and self.sequences_played >= len(config.sequences):
+                self.running = False
+
+    writer = FrameWriter(output, size, config.total_fps)
+    app = ExportApplication(writer)
+    wall_start = time.perf_counter()
+    try:
+        app.run()
+    finally:
+        writer.close()
+    wall_time = time.perf_counter() - wall_start
+
+    show_time = writer.frames_written / config.total_fps
+    return {
+        'output': output,
+        'frames': writer.frames_written,
+        'show_seconds': show_time,
+        'wall_seconds': wall_time,
+        'render_fps': writer.frames_written / max(wall_time, 1e-6),
+        'speedup': show_time / max(wall_time, 1e-6),
+    }
+
+def export_main(argv=None):
+    from config import Config
+
+    parser = argparse.ArgumentParser(prog='main.py --export',
+                                     description='Render the show offline, faster than real time, to a video or PNG sequence')
+    parser.add_argument('output', help='Output .mp4/.mov/.mkv file, or a directory for a PNG sequence')
+    parser.add_argument('--size', type=int, nargs=2, metavar=('WIDTH', 'HEIGHT'), default=(1920, 1080),
+                      help='Output resolution')
+    parser.add_argument('--duration', type=float,
+                      help='Seconds of show to render (default: one full cycle through all sequences)')
+    args = parser.parse_args(argv)
+
+    report = render_show(Config(), args.output, tuple(args.size), args.duration)
+    print(
+        f"Rendered {report['frames']} frames ({report['show_seconds']:.1f}s of show) "
+        f"in {report['wall_seconds']:.1f}s: {report['render_fps']:.1f} fps, "
+        f"{report['speedup']:.2f}x real time"
+    )
+
+if __name__ == "__main__":
+    export_main()
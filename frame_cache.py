@@ -0,0 +1,233 @@
+import argparse
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+import numpy as np
+
+class FrameCache:
+    """Persistent on-disk cache of display-ready RGBA frames, read back through mmap"""
+    def __init__(self, directory, budget_bytes):
+        self.directory = directory
+        self.budget_bytes = budget_bytes
+        self.lock = Lock()
+        self.entries = OrderedDict()  # filename -> bytes, least recently used first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._scan()
+
+    def _scan(self):
+        found = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.rgba'):
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            found.append((stat.st_mtime, name, stat.st_size))
+
+        for _, name, size in sorted(found):
+            self.entries[name] = size
+            self.total_bytes += size
+
+    def _entry_name(self, path, size, resampling, preset):
+        # An edited source or changed settings never hits a stale entry
+        stat = os.stat(path)
+        key = (
+            f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|"
+            f"{size[0]}x{size[1]}|{resampling}|{preset}"
+        )
+        return hashlib.sha1(key.encode()).hexdigest() + '.rgba'
+
+    def lookup(self, path, size, resampling='lanczos', preset='quality'):
+        """Return a read-only memory-mapped (height, width, 4) array, or None on a miss"""
+        try:
+            name = self._entry_name(path, size, resampling, preset)
+        except OSError:
+            return None
+
+        entry_path = os.path.join(self.directory, name)
+        with self.lock:
+            if self.entries.get(name) != size[0] * size[1] * 4:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(name)
+            self.hits += 1
+
+        try:
+            # File mtimes are the LRU order, which survives restarts
+            os.utime(entry_path)
+            return np.memmap(entry_path, dtype=np.uint8, mode='r', shape=(size[1], size[0], 4))
+        except (OSError, ValueError):
+            self._forget(name)
+            return None
+
+    def store(self, path, size, pixels, resampling='lanczos', preset='quality'):
+        """Write a decoded frame for path, evicting least recently used entries over budget"""
+        try:
+            name = self._entry_name(path, size, resampling, preset)
+        except OSError:
+            return
+
+        entry_path = os.path.join(self.directory, name)
+        temp_path = f"{entry_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                np.ascontiguousarray(pixels).tofile(f)
+            os.replace(temp_path, entry_path)
+        except OSError as e:
+            print(f"Error writing frame cache entry for {path}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+
+        with self.lock:
+            self.total_bytes -= self.entries.pop(name, 0)
+            self.entries[name] = pixels.nbytes
+            self.total_bytes += pixels.nbytes
+            evicted = self._evict()
+
+        for old_name in evicted:
+            try:
+                os.remove(os.path.join(self.directory, old_name))
+            except FileNotFoundError:
+                pass
+
+    def _evict(self):
+        evicted = []
+        while self.total_bytes > self.budget_bytes and len(self.entries) > 1:
+            old_name, old_size = self.entries.popitem(last=False)
+            self.total_bytes -= old_size
+            evicted.append(old_name)
+        return evicted
+
+    def _forget(self, name):
+        with self.lock:
+            self.total_bytes -= self.entries.pop(name, 0)
+
+class MemoryFrameCache:
+    """Process-wide LRU cache of decoded frames kept in RAM, bounded by bytes rather than frames"""
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.lock = Lock()
+        self.entries = OrderedDict()  # key -> read-only pixel array, least recently used first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, path, size, resampling, preset):
+        stat = os.stat(path)
+        return (os.path.abspath(path), stat.st_mtime_ns, tuple(size), resampling, preset)
+
+    def lookup(self, path, size, resampling='lanczos', preset='quality'):
+        """Return the cached (height, width, 4) array for path, or None on a miss"""
+        try:
+            key = self._key(path, size, resampling, preset)
+        except OSError:
+            return None
+
+        with self.lock:
+            pixels = self.entries.get(key)
+            if pixels is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return pixels
+
+    def store(self, path, size, pixels, resampling='lanczos', preset='quality'):
+        """Keep a private copy of a decoded frame, evicting least recently used frames over budget"""
+        if pixels.nbytes > self.budget_bytes:
+            return
+        try:
+            key = self._key(path, size, resampling, preset)
+        except OSError:
+            return
+
+        copy = np.array(pixels, copy=True)
+        copy.flags.writeable = False
+
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old.nbytes
+            self.entries[key] = copy
+            self.total_bytes += copy.nbytes
+
+            while self.total_bytes > self.budget_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.total_bytes -= evicted.nbytes
+
+    def format_stats(self):
+        lookups = max(self.hits + self.misses, 1)
+        return (
+            f"{len(self.entries)} frames, {self.total_bytes / 1024 ** 2:.0f} MB, "
+            f"{self.hits} hits / {self.misses} misses ({self.hits * 100 / lookups:.0f}%)"
+        )
+
+def warm_directory(cache, config, directory, start_index, workers):
+    """Decode every frame of a sequence directory from start_index into the cache"""
+    from frame_decoder import FrameDecoderPool
+
+    paths = sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.endswith('.jpg') and name[:-4].isdigit() and int(name[:-4]) >= start_index
+    )
+    size = config.final_resolution_model
+    resampling = config.resampling
+    for sequence in config.sequences:
+        if os.path.abspath(sequence['image_directory']) == os.path.abspath(directory):
+            resampling = sequence.get('resampling', resampling)
+    decoder = FrameDecoderPool(size, max(1, workers) * 2, workers)
+    pending = []
+    warmed = 0
+    start = time.time()
+
+    def finish_oldest():
+        done_path, slot, future = pending.pop(0)
+        try:
+            future.result()
+            cache.store(done_path, size, decoder.pixels(slot), resampling, config.decode_preset)
+            return 1
+        except Exception as e:
+            print(f"Error decoding {done_path}: {e}")
+            return 0
+        finally:
+            decoder.release_slot(slot)
+
+    try:
+        for path in paths:
+            if cache.lookup(path, size, resampling, config.decode_preset) is not None:
+                continue
+            slot = decoder.acquire_slot()
+            pending.append((path, slot, decoder.submit(path, slot, resampling=resampling, preset=config.decode_preset)))
+
+            while pending and (pending[0][2].done() or decoder.free_slots.empty()):
+                warmed += finish_oldest()
+
+        while pending:
+            warmed += finish_oldest()
+    finally:
+        decoder.shutdown()
+
+    print(f"Warmed {warmed} of {len(paths)} frames from {directory} in {time.time() - start:.1f}s")
+
+if __name__ == "__main__":
+    from config import Config
+
+    config = Config()
+    parser = argparse.ArgumentParser(description='Pre-warm the on-disk frame cache for a sequence directory')
+    parser.add_argument('directory', help='Sequence directory with numbered JPEG frames')
+    parser.add_argument('--cache-dir', default=config.frame_cache_directory or 'results/frame_cache',
+                      help='Frame cache directory')
+    parser.add_argument('--budget', type=int, default=config.frame_cache_budget,
+                      help='Cache size budget in bytes')
+    parser.add_argument('--start', type=int, default=0,
+                      help='First frame number to warm')
+    parser.add_argument('--workers', type=int, default=config.decode_workers,
+                      help='Decode worker processes')
+    args = parser.parse_args()
+
+    warm_directory(FrameCache(args.cache_dir, args.budget), config, args.directory, args.start, args.workers)
@@ -0,0 +1,160 @@
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+from queue import Queue
+import numpy as np
+from PIL import Image
+
+RESAMPLING_TIERS = {
+    'lanczos': Image.Resampling.LANCZOS,
+    'bicubic': Image.Resampling.BICUBIC,
+    'bilinear': Image.Resampling.BILINEAR,
+    'nearest': Image.Resampling.NEAREST,
+}
+
+# draft_scale: how far above the target size JPEG DCT scaling may stop,
+# reducing_gap: passed to Image.resize to box-reduce by integer factors first,
+# resampling: tier forced by the preset (None keeps the sequence's own tier)
+DECODE_PRESETS = {
+    'quality': {'draft_scale': 2, 'reducing_gap': 3.0, 'resampling': None},
+    'speed': {'draft_scale': 1, 'reducing_gap': 1.5, 'resampling': 'bilinear'},
+}
+
+def plan_fit(source_size, size, keep_aspect=True):
+    """Return the (width, height) an image of source_size is scaled to inside size"""
+    if not keep_aspect:
+        return size
+
+    img_ratio = source_size[0] / source_size[1]
+    target_ratio = size[0] / size[1]
+
+    if img_ratio > target_ratio:
+        return size[0], int(size[0] / img_ratio)
+    return int(size[1] * img_ratio), size[1]
+
+def prepare_image(path, size, keep_aspect=True, resampling='lanczos', preset='quality'):
+    """Decode an image file and fit it into size, letterboxing when keeping aspect"""
+    has_alpha = path.endswith('.png')
+    options = DECODE_PRESETS[preset]
+    resample = RESAMPLING_TIERS[options['resampling'] or resampling]
+
+    image = Image.open(path)
+    fitted = plan_fit(image.size, size, keep_aspect)
+
+    # Scale oversized JPEGs down while decoding
+    if image.format == 'JPEG' and (image.width > fitted[0] or image.height > fitted[1]):
+        scale = options['draft_scale']
+        image.draft('RGB', (fitted[0] * scale, fitted[1] * scale))
+
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    if image.size != fitted:
+        image = image.resize(fitted, resample, reducing_gap=options['reducing_gap'])
+
+    if fitted != tuple(size):
+        new_img = Image.new(
+            'RGBA' if has_alpha else 'RGB',
+            size,
+            (0, 0, 0, 0 if has_alpha else 255)
+        )
+        paste_x = (size[0] - fitted[0]) // 2
+        paste_y = (size[1] - fitted[1]) // 2
+        new_img.paste(image, (paste_x, paste_y))
+        image = new_img
+
+    return image
+
+def _slot_views(buffer, slot_count, size):
+    slot_bytes = size[0] * size[1] * 4
+    return [
+        np.ndarray((size[1], size[0], 4), dtype=np.uint8, buffer=buffer, offset=i * slot_bytes)
+        for i in range(slot_count)
+    ]
+
+def _decode_into(slot_view, path, size, keep_aspect, resampling, preset):
+    """Decode path into slot_view, returning the seconds it took"""
+    start = time.perf_counter()
+    image = prepare_image(path, size, keep_aspect, resampling, preset).convert('RGBA')
+    slot_view.reshape(-1)[:] = np.frombuffer(image.tobytes(), dtype=np.uint8)
+    return time.perf_counter() - start
+
+# Per-process state of decode workers, set up once by _init_worker
+_worker_shm = None
+_worker_slots = None
+
+def _init_worker(shm_name, slot_count, size):
+    global _worker_shm, _worker_slots
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_slots = _slot_views(_worker_shm.buf, slot_count, size)
+
+def _decode_worker(path, slot, size, keep_aspect, resampling, preset):
+    return _decode_into(_worker_slots[slot], path, size, keep_aspect, resampling, preset)
+
+class FrameDecoderPool:
+    """Decodes image frames in worker processes into shared-memory slots"""
+    def __init__(self, size, slot_count, workers):
+        self.size = size
+        self.slot_count = slot_count
+        self.workers = workers
+        self.shm = shared_memory.SharedMemory(
+            create=True,
+            size=size[0] * size[1] * 4 * slot_count
+        )
+        self.slots = _slot_views(self.shm.buf, slot_count, size)
+
+        self.free_slots = Queue()
+        for slot in range(slot_count):
+            self.free_slots.put(slot)
+
+        self.executor = None
+        if workers > 0:
+            self.executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.shm.name, slot_count, size)
+            )
+
+    @property
+    def max_in_flight(self):
+        """Number of frames worth decoding ahead to keep every worker busy"""
+        return max(1, self.workers)
+
+    def acquire_slot(self, timeout=None):
+        """Take a free slot, raising queue.Empty if none frees up within timeout"""
+        return self.free_slots.get(timeout=timeout)
+
+    def release_slot(self, slot):
+        self.free_slots.put(slot)
+
+    def submit(self, path, slot, keep_aspect=True, resampling='lanczos', preset='quality'):
+        """Decode path into slot, returning a future that resolves to the decode time in seconds"""
+        if self.executor:
+            return self.executor.submit(
+                _decode_worker, path, slot, self.size, keep_aspect, resampling, preset
+            )
+
+        future = Future()
+        try:
+            future.set_result(
+                _decode_into(self.slots[slot], path, self.size, keep_aspect, resampling, preset)
+            )
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def pixels(self, slot):
+        return self.slots[slot]
+
+    def shutdown(self):
+        if self.executor:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+        if self.shm:
+            self.slots = []
+            try:
+                self.shm.close()
+            except BufferError as e:
+                print(f"Frame slots still referenced at shutdown: {e}")
+            self.shm.unlink()
+            self.shm = None
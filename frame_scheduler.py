@@ -0,0 +1,77 @@
+import ctypes
+import time
+import sdl2
+
+class FrameScheduler:
+    """Paces display ticks against absolute deadlines on the monotonic clock"""
+    def __init__(self, fps, refresh_rate=0, late_tolerance=0.002, spin_threshold=0.002):
+        self.interval = 1.0 / fps
+        self.refresh_interval = 0.0
+        # With vsync the interval is a whole number of refresh periods
+        if refresh_rate > 0:
+            self.refresh_interval = 1.0 / refresh_rate
+            periods = max(1, round(self.interval / self.refresh_interval))
+            self.interval = periods * self.refresh_interval
+
+        self.late_tolerance = late_tolerance
+        self.spin_threshold = spin_threshold
+        self.origin = None
+        self.frame_number = 0
+
+    def reset(self):
+        """Start a new run of deadlines from the next call to wait"""
+        self.origin = None
+        self.frame_number = 0
+
+    def wait(self, on_event=None):
+        """Sleep until the next deadline and return (deadline, late, dropped)"""
+        if self.origin is None:
+            self.origin = time.perf_counter()
+            return self.origin, False, 0
+
+        # Absolute deadlines, so rounding in individual sleeps never accumulates into drift; wake half
+        # a refresh early so a blocking vsync present lands on the intended vblank
+        self.frame_number += 1
+        deadline = self.origin + self.frame_number * self.interval
+        wake_time = deadline - self.refresh_interval / 2
+        self._sleep_until(wake_time, on_event)
+
+        lateness = time.perf_counter() - wake_time
+        # Deadlines missed entirely are skipped and counted as dropped
+        dropped = 0
+        if lateness >= self.interval:
+            dropped = int(lateness // self.interval)
+            self.frame_number += dropped
+            deadline += dropped * self.interval
+
+        return deadline, lateness > self.late_tolerance, dropped
+
+    def _sleep_until(self, wake_time, on_event):
+        # on_event handles SDL input as soon as it arrives during the wait
+        while True:
+            remaining = wake_time - time.perf_counter()
+            if remaining <= 0:
+                return
+
+            if remaining > self.spin_threshold:
+                timeout_ms = int((remaining - self.spin_threshold) * 1000)
+                if timeout_ms > 0 and sdl2.SDL_WaitEventTimeout(None, timeout_ms) and on_event:
+                    on_event()
+                    continue
+
+            # Hand the rest of the slice back to the OS while spinning on the last couple of milliseconds
+            time.sleep(0)
+
+    @staticmethod
+    def vsync_refresh_rate(window, renderer):
+        """Refresh rate to align to, or 0 when the renderer does not present with vsync"""
+        info = sdl2.SDL_RendererInfo()
+        if sdl2.SDL_GetRendererInfo(renderer, ctypes.byref(info)) != 0:
+            return 0
+        if not info.flags & sdl2.SDL_RENDERER_PRESENTVSYNC:
+            return 0
+
+        mode = sdl2.SDL_DisplayMode()
+        if sdl2.SDL_GetWindowDisplayMode(window, ctypes.byref(mode)) != 0:
+            return 0
+        return mode.refresh_rate
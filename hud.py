@@ -0,0 +1,157 @@
+import ctypes
+from collections import OrderedDict
+import sdl2
+import sdl2.sdlttf
+
+class GlyphAtlas:
+    """Printable ASCII glyphs of one font rendered once into a single texture"""
+    FIRST_CHAR = 32
+    LAST_CHAR = 126
+
+    def __init__(self, renderer, font, registry, max_layouts=64):
+        self.renderer = renderer
+        self.registry = registry
+        self.max_layouts = max_layouts
+        self.layouts = OrderedDict()  # (text, x, y, color) -> layout, so drawing allocates no surfaces or textures
+        self.glyphs = {}  # char -> (SDL_Rect in atlas, advance)
+        self.texture = None
+        self.width = 0
+        self.height = sdl2.sdlttf.TTF_FontHeight(font)
+        self.use_geometry = sdl2.dll.version >= 2018
+        self._build(font)
+
+    def _build(self, font):
+        white = sdl2.SDL_Color(255, 255, 255, 255)
+        surfaces = []
+        for code in range(self.FIRST_CHAR, self.LAST_CHAR + 1):
+            surface = sdl2.sdlttf.TTF_RenderText_Blended(font, bytes([code]), white)
+            if not surface:
+                continue
+            advance = ctypes.c_int()
+            if sdl2.sdlttf.TTF_GlyphMetrics(font, code, None, None, None, None, ctypes.byref(advance)) != 0:
+                advance.value = surface.contents.w
+            surfaces.append((chr(code), surface, advance.value))
+
+        self.width = sum(surface.contents.w for _, surface, _ in surfaces)
+        atlas = sdl2.SDL_CreateRGBSurfaceWithFormat(0, max(self.width, 1), self.height, 32, sdl2.SDL_PIXELFORMAT_RGBA32)
+
+        x = 0
+        for char, surface, advance in surfaces:
+            w = surface.contents.w
+            sdl2.SDL_SetSurfaceBlendMode(surface, sdl2.SDL_BLENDMODE_NONE)
+            sdl2.SDL_BlitSurface(surface, None, atlas, sdl2.SDL_Rect(x, 0, w, self.height))
+            self.glyphs[char] = (sdl2.SDL_Rect(x, 0, w, self.height), advance)
+            x += w
+            sdl2.SDL_FreeSurface(surface)
+
+        self.texture = self.registry.create_from_surface(self.renderer, atlas, 'hud')
+        sdl2.SDL_FreeSurface(atlas)
+        if self.texture:
+            sdl2.SDL_SetTextureBlendMode(self.texture, sdl2.SDL_BLENDMODE_BLEND)
+
+    def measure(self, text):
+        return sum(self.glyphs.get(char, self.glyphs.get('?', (None, 0)))[1] for char in text)
+
+    def _layout(self, text, x, y, color):
+        key = (text, x, y, color)
+        layout = self.layouts.get(key)
+        if layout is not None:
+            self.layouts.move_to_end(key)
+            return layout
+
+        quads = []
+        pen = x
+        for char in text:
+            glyph = self.glyphs.get(char) or self.glyphs.get('?')
+            if not glyph:
+                continue
+            src, advance = glyph
+            if char != ' ':
+                quads.append((src, sdl2.SDL_Rect(pen, y, src.w, src.h)))
+            pen += advance
+
+        if self.use_geometry:
+            layout = self._geometry(quads, color)
+        else:
+            layout = quads
+
+        self.layouts[key] = layout
+        if len(self.layouts) > self.max_layouts:
+            self.layouts.popitem(last=False)
+        return layout
+
+    def _geometry(self, quads, color):
+        vertices = (sdl2.SDL_Vertex * (len(quads) * 4))()
+        indices = (ctypes.c_int * (len(quads) * 6))()
+        vertex_color = sdl2.SDL_Color(color[0], color[1], color[2], 255)
+
+        for i, (src, dst) in enumerate(quads):
+            u0, u1 = src.x / self.width, (src.x + src.w) / self.width
+            corners = (
+                (dst.x, dst.y, u0, 0.0),
+                (dst.x + dst.w, dst.y, u1, 0.0),
+                (dst.x + dst.w, dst.y + dst.h, u1, 1.0),
+                (dst.x, dst.y + dst.h, u0, 1.0),
+            )
+            for j, (px, py, u, v) in enumerate(corners):
+                vertex = vertices[i * 4 + j]
+                vertex.position.x, vertex.position.y = px, py
+                vertex.color = vertex_color
+                vertex.tex_coord.x, vertex.tex_coord.y = u, v
+            base = i * 4
+            indices[i * 6:i * 6 + 6] = [base, base + 1, base + 2, base, base + 2, base + 3]
+
+        return vertices, indices
+
+    def draw(self, text, x, y, color=(255, 255, 255)):
+        if not self.texture:
+            return
+
+        layout = self._layout(text, x, y, tuple(color))
+
+        if self.use_geometry:
+            vertices, indices = layout
+            if len(indices):
+                sdl2.SDL_RenderGeometry(self.renderer, self.texture, vertices, len(vertices), indices, len(indices))
+        else:
+            sdl2.SDL_SetTextureColorMod(self.texture, color[0], color[1], color[2])
+            for src, dst in layout:
+                sdl2.SDL_RenderCopy(self.renderer, self.texture, src, dst)
+
+    def destroy(self):
+        if self.texture:
+            self.registry.destroy(self.texture)
+            self.texture = None
+        self.layouts.clear()
+
+class HudPanel:
+    """Multi-line statistics panel on a translucent background, toggled at runtime"""
+    def __init__(self, renderer, atlas, x=10, y=10, padding=8, visible=True):
+        self.renderer = renderer
+        self.atlas = atlas
+        self.x = x
+        self.y = y
+        self.padding = padding
+        self.visible = visible
+        self.background = sdl2.SDL_Rect()
+
+    def toggle(self):
+        self.visible = not self.visible
+
+    def draw(self, lines):
+        if not self.visible or not self.atlas:
+            return
+
+        line_height = self.atlas.height
+        self.background.x = self.x
+        self.background.y = self.y
+        self.background.w = max(self.atlas.measure(line) for line in lines) + 2 * self.padding
+        self.background.h = line_height * len(lines) + 2 * self.padding
+
+        sdl2.SDL_SetRenderDrawBlendMode(self.renderer, sdl2.SDL_BLENDMODE_BLEND)
+        sdl2.SDL_SetRenderDrawColor(self.renderer, 0, 0, 0, 160)
+        sdl2.SDL_RenderFillRect(self.renderer, self.background)
+        sdl2.SDL_SetRenderDrawBlendMode(self.renderer, sdl2.SDL_BLENDMODE_NONE)
+
+        for i, line in enumerate(lines):
+            self.atlas.draw(line, self.x + self.padding, self.y + self.padding + i * line_height)
@@ -1,65 +1,219 @@
 import os
 import time
-from threading import Thread, Lock
-from queue import Queue
+from collections import deque
+from concurrent.futures import Future
+from threading import Thread, Lock, Event
+from queue import Queue, Empty
+from directory_watcher import DirectoryWatcher
 
 class ImageSequencePlayer:
     """Handles image sequence playback with interpolation"""
-    def __init__(self, config, texture_manager):
+    def __init__(self, config, texture_manager, frame_decoder, frame_cache=None, memory_cache=None,
+                 prefetch_limit=None):
         self.config = config
         self.texture_manager = texture_manager
+        self.frame_decoder = frame_decoder
+        self.frame_cache = frame_cache
+        self.memory_cache = memory_cache
         self.frame_buffer = Queue(maxsize=config.buffer_size)
         self.buffer_lock = Lock()
+        self.stop_event = Event()
+        self.loader_thread = None
+        self.last_decode_time = 0.0
+        self.bursting = True
+        # Frames decoded ahead at most, e.g. for the next sequence during video; None buffers normally
+        self.prefetch_limit = prefetch_limit
+        self.image_directory = None
+        self.resampling = config.resampling
+        self.opening_end = 0  # frames before this index are the ones a restart needs first
 
     def start_loader_thread(self, start_index):
-        loader_thread = Thread(
-            target=self._buffer_loader_thread, 
-            args=(start_index,), 
+        self.opening_end = start_index + self.config.buffer_size * self.config.frame_step
+        self.loader_thread = Thread(
+            target=self._buffer_loader_thread,
+            args=(start_index,),
             daemon=True
         )
-        loader_thread.start()
+        self.loader_thread.start()
+
+    def stop(self):
+        """Stop the loader thread and hand its frame slots back to the decoder"""
+        self.stop_event.set()
+        if self.loader_thread:
+            self.loader_thread.join()
+            self.loader_thread = None
+        self.clear_buffer()
+
+    def _frame_name(self, index):
+        return f"{index:09d}.jpg"
+
+    def _frame_path(self, index):
+        return os.path.join(self.image_directory, self._frame_name(index))
+
+    def _submit(self, index, slot, resampling):
+        return self.frame_decoder.submit(
+            self._frame_path(index),
+            slot,
+            resampling=resampling,
+            preset=self.config.decode_preset
+        )
+
+    def _caches(self, index):
+        """Caches that may hold frame index; RAM only keeps the opening frames of each sequence"""
+        # Playback cycles through every sequence, so an LRU over all frames would evict the openings first
+        if index < self.opening_end:
+            return (self.memory_cache, self.frame_cache)
+        return (self.frame_cache,)
+
+    def _load_cached(self, index, resampling):
+        """Take a frame from the RAM or on-disk cache, returning a resolved future with the lookup time"""
+        start = time.perf_counter()
+        pixels = None
+        for cache in self._caches(index):
+            if cache:
+                pixels = cache.lookup(
+                    self._frame_path(index),
+                    self.config.final_resolution_model,
+                    resampling,
+                    self.config.decode_preset
+                )
+            if pixels is not None:
+                break
+        else:
+            return None, None
+
+        future = Future()
+        future.set_result(time.perf_counter() - start)
+        return pixels, future
 
     def _buffer_loader_thread(self, start_index):
-        current_index = start_index
+        resampling = self.resampling
+        next_index = start_index
+        pending = deque()  # (index, slot, pixels, future) in playback order, slot is None for cached frames
         frame_interval = 1.0 / self.config.source_fps
-        last_frame_time = time.time()
+        last_frame_time = time.time() - frame_interval  # hand over the first frame as soon as it is ready
+        watcher = DirectoryWatcher(self.image_directory, pattern=r'\d{9}\.jpg')
+
+        while not self.stop_event.is_set():
+            # Keep every decode worker busy with upcoming frames that have been completely written
+            while len(pending) < self._decode_ahead():
+                if not watcher.is_ready(self._frame_name(next_index)):
+                    break
+                watcher.forget(self._frame_name(next_index))
+                pixels, future = self._load_cached(next_index, resampling)
+                if future:
+                    pending.append((next_index, None, pixels, future))
+                    next_index += self.config.frame_step
+                    continue
+                try:
+                    slot = self.frame_decoder.acquire_slot(timeout=0.01)
+                except Empty:
+                    break
+                pending.append((
+                    next_index,
+                    slot,
+                    self.frame_decoder.pixels(slot),
+                    self._submit(next_index, slot, resampling)
+                ))
+                next_index += self.config.frame_step
+
+            if not pending:
+                if self._decode_ahead() <= 0:
+                    time.sleep(0.01)
+                    continue
+                watcher.wait_for(self._frame_name(next_index), timeout=0.5)
+                continue
 
-        while True:
             current_time = time.time()
 
-            if current_time - last_frame_time >= frame_interval:
+            # Burst-load below the low-water mark until the high-water mark, then match the source rate
+            level = self.frame_buffer.qsize()
+            if level >= self.config.prefetch_high_water:
+                self.bursting = False
+            elif level <= self.config.prefetch_low_water:
+                self.bursting = True
+
+            if self.bursting or current_time - last_frame_time >= frame_interval:
                 if self.frame_buffer.full():
                     time.sleep(0.1)
                     continue
 
-                image_path = os.path.join(
-                    self.config.image_directory, 
-                    f"{current_index:09d}.jpg"
-                )
+                index, slot, pixels, future = pending[0]
+                if not future.done():
+                    time.sleep(0.001)
+                    continue
 
-                if not os.path.exists(image_path):
+                if future.exception() is not None:
+                    print(f"Error loading image {self._frame_path(index)}: {future.exception()}")
                     time.sleep(0.5)
+                    pending[0] = (index, slot, pixels, self._submit(index, slot, resampling))
                     continue
 
-                texture = self.texture_manager.load_image(
-                    image_path, 
-                    self.config.final_resolution_model, 
-                    keep_aspect=True
-                )
-
-                if texture:
-                    self.frame_buffer.put((current_index, texture))
-                    current_index += self.config.frame_step
-                    last_frame_time = current_time
-                else:
-                    time.sleep(0.5)
+                pending.popleft()
+                if slot is not None:
+                    for cache in self._caches(index):
+                        if cache:
+                            cache.store(
+                                self._frame_path(index),
+                                self.config.final_resolution_model,
+                                pixels,
+                                resampling,
+                                self.config.decode_preset
+                            )
+                self.frame_buffer.put((index, slot, pixels, future.result()))
+                last_frame_time = current_time
 
             time.sleep(0.001)
 
-    def set_directory(self, new_directory):
+        watcher.close()
+        for _, slot, _, future in pending:
+            if slot is None:
+                continue
+            try:
+                future.result()
+            except Exception:
+                pass
+            self.frame_decoder.release_slot(slot)
+
+    def _decode_ahead(self):
+        """Number of frames that may be in flight, kept within prefetch_limit while one is set"""
+        if self.prefetch_limit is None:
+            return self.frame_decoder.max_in_flight
+        return min(self.frame_decoder.max_in_flight, self.prefetch_limit - self.frame_buffer.qsize())
+
+    def set_prefetch_limit(self, limit):
+        self.prefetch_limit = limit
+
+    def next_frame(self):
+        """Take the next decoded frame and upload it into a ring texture on the calling (render) thread"""
+        index, slot, pixels, self.last_decode_time = self.frame_buffer.get()
+        texture = self.texture_manager.upload_frame(pixels)
+        self._release(slot)
+        return index, texture
+
+    def next_frame_pixels(self, consume):
+        """Take the next decoded frame and pass its pixels to consume before the slot is reused"""
+        index, slot, pixels, self.last_decode_time = self.frame_buffer.get()
+        try:
+            consume(pixels)
+        finally:
+            self._release(slot)
+        return index
+
+    def _release(self, slot):
+        if slot is not None:
+            self.frame_decoder.release_slot(slot)
+
+    def clear_buffer(self):
         with self.buffer_lock:
-            # Clear existing buffer
-            while not self.frame_buffer.empty():
-                _, texture = self.frame_buffer.get()
-                sdl2.SDL_DestroyTexture(texture)
-        self.config.image_directory = new_directory
\ No newline at end of file
+            while True:
+                try:
+                    _, slot, _, _ = self.frame_buffer.get_nowait()
+                except Empty:
+                    break
+                self._release(slot)
+
+    def set_directory(self, new_directory, resampling=None):
+        self.clear_buffer()
+        self.image_directory = new_directory
+        self.resampling = resampling or self.config.resampling
@@ -8,17 +8,86 @@ from sdl_app import SDLApp
 from texture_manager import TextureManager
 from video_player import VideoPlayer
 from image_sequence_player import ImageSequencePlayer
+from frame_decoder import FrameDecoderPool
+from frame_cache import FrameCache, MemoryFrameCache
+from overlay_cache import OverlayCache
+from cpu_compositor import CpuCompositor, is_software_renderer
+from motion_interpolation import MotionInterpolator
+from texture_registry import TextureRegistry
+from metrics import PlaybackMetrics, MetricsServer, JsonLinesSink
 from transition_manager import TransitionManager
 from playback_stats import PlaybackStatistics
+from frame_scheduler import FrameScheduler
+from hud import HudPanel
 
 class Application:
-    def __init__(self, monitor_index):
-        self.config = Config()
-        self.sdl_app = SDLApp(monitor_index)
-        self.texture_manager = TextureManager(self.sdl_app.renderer)
-        self.sequence_player = ImageSequencePlayer(self.config, self.texture_manager)
-        self.transition_manager = TransitionManager(self.sdl_app.renderer, self.config)
+    def __init__(self, monitor_index, config=None, software_renderer=False):
+        self.config = config or Config()
+        self.textures = TextureRegistry(self.config.texture_debug)
+        self.sdl_app = SDLApp(monitor_index, software_renderer, self.textures)
+        self.texture_manager = TextureManager(self.sdl_app.renderer, self.config.texture_pool_limit, self.textures)
+        self.frame_decoder = FrameDecoderPool(
+            self.config.final_resolution_model,
+            self.config.buffer_size + self.config.decode_workers + 1,
+            self.config.decode_workers
+        )
+        self.frame_cache = None
+        if self.config.frame_cache_directory:
+            self.frame_cache = FrameCache(self.config.frame_cache_directory, self.config.frame_cache_budget)
+        self.memory_cache = None
+        if self.config.memory_cache_budget:
+            self.memory_cache = MemoryFrameCache(self.config.memory_cache_budget)
+        self.sequence_player = ImageSequencePlayer(
+            self.config, self.texture_manager, self.frame_decoder, self.frame_cache, self.memory_cache
+        )
+        self.next_sequence_player = None
+        self.transition_manager = TransitionManager(self.sdl_app.renderer, self.config, self.texture_manager)
+        self.cpu_compositor = None
+        if self.config.interpolation_engine == 'motion':
+            print("Motion-compensated interpolation: compositing on the CPU")
+            self._create_cpu_compositor(MotionInterpolator(
+                self.config.final_resolution_model,
+                self.config.motion_block_size,
+                self.config.motion_scale,
+                self.config.motion_search,
+                self.config.decode_workers
+            ))
+        elif self.config.compositing == 'cpu' or (
+                self.config.compositing == 'auto' and is_software_renderer(self.sdl_app.renderer)):
+            print("Software renderer: compositing on the CPU")
+            self._create_cpu_compositor()
+        if not self.cpu_compositor:
+            # The CPU compositor uploads into its own textures
+            self.texture_manager.create_frame_ring(
+                self.config.final_resolution_model,
+                self.config.texture_ring_size
+            )
+        self.overlay_cache = OverlayCache(
+            self.texture_manager,
+            self.config.final_resolution,
+            self.config.overlay_cache_budget,
+            self.config.decode_workers,
+            self.config.overlay_tile_size,
+            keep_images=self.cpu_compositor is not None
+        )
         self.stats = PlaybackStatistics()
+        self.metrics = PlaybackMetrics(
+            1.0 / self.config.total_fps,
+            max(self.config.buffer_size, self.config.video_queue_size),
+            self.config.metrics_window,
+            self.textures
+        )
+        self.metrics_server = None
+        if self.config.metrics_port:
+            try:
+                self.metrics_server = MetricsServer(self.metrics, self.config.metrics_port)
+            except OSError as e:
+                print(f"Metrics endpoint disabled, cannot listen on port {self.config.metrics_port}: {e}")
+        self.metrics_sink = None
+        if self.config.metrics_jsonl_path:
+            self.metrics_sink = JsonLinesSink(self.metrics, self.config.metrics_jsonl_path, self.config.metrics_interval)
+        self.hud = HudPanel(self.sdl_app.renderer, self.sdl_app.glyph_atlas)
+        self.last_tick_time = None
 
         self.running = True
         self.video_mode_started = False
@@ -27,9 +96,13 @@ class Application:
         self.pre_fade_prepared = False
         self.fade_preparation_started = False
         self.pre_fade_threshold = 0.5
-        self.fade_textures = None
+        self.fade_base = None
+        self.fade_to_white = True
         self.white_transition = None
         self.video_player = None
+        self.video_due_time = 0
+        # Seconds to block for decoded frames instead of holding the previous one (offline rendering)
+        self.decode_wait = None
 
         self.frame_in_sequence = 0
         self.interpolated_frames = []
@@ -37,8 +110,12 @@ class Application:
         self.next_texture = None
         self.last_full_frame_texture = None
 
-        self.last_display_time = time.time()
+        self.scheduler = FrameScheduler(
+            self.config.total_fps,
+            FrameScheduler.vsync_refresh_rate(self.sdl_app.window, self.sdl_app.renderer)
+        )
         self.fade_start_time = 0
+        self.crossfade_start_time = 0
 
         self.dest_rect = sdl2.SDL_Rect(
             0, 
@@ -58,20 +135,25 @@ class Application:
             elif event.type == sdl2.SDL_KEYDOWN:
                 if event.key.keysym.sym in (sdl2.SDLK_ESCAPE, sdl2.SDLK_q):
                     self.running = False
+                elif event.key.keysym.sym == sdl2.SDLK_h:
+                    self.hud.toggle()
 
     def run(self):
         self._initialize()
 
         while self.running:
-            current_time = time.time()
-
-            if current_time - self.last_display_time < 1.0 / self.config.total_fps:
-                time.sleep(0.001)
-                continue
-
-            self.last_display_time = current_time
+            current_time, late, dropped = self.scheduler.wait(self.handle_events)
+            self.stats.record_frame_timing(late, dropped)
+            self.metrics.record_frame_timing(late, dropped)
+            tick_time = time.perf_counter()
+            if self.last_tick_time is not None:
+                self.stats.record_frame_time(tick_time - self.last_tick_time)
+                self.metrics.frame_time.observe(tick_time - self.last_tick_time)
+            self.last_tick_time = tick_time
 
             self.handle_events()
+            if not self.running:
+                break
 
             sdl2.SDL_SetRenderDrawColor(self.sdl_app.renderer, 0, 0, 0, 255)
             sdl2.SDL_RenderClear(self.sdl_app.renderer)
@@ -80,75 +162,123 @@ class Application:
                 self._handle_fade_transition(current_time)
             elif self.fade_completed and self.video_mode_started:
                 if self.white_transition:
-                    self._handle_white_transition()
+                    self._handle_white_transition(current_time)
                 else:
-                    self._handle_video_playback()
+                    self._handle_video_playback(current_time)
             else:
-                self._handle_image_sequence()
+                self._handle_image_sequence(current_time)
 
-            stats_text = self.stats.format_stats()
-            self.sdl_app.render_text(stats_text, 10, 10)
+            queue_depth = self.sequence_player.frame_buffer.qsize()
+            self.stats.update_buffer_level(queue_depth, self.config.buffer_size, self.sequence_player.bursting)
+            if self.fade_completed and self.video_mode_started and self.video_player:
+                self.metrics.queue_depth.observe(self.video_player.queue_depth())
+            else:
+                self.metrics.queue_depth.observe(queue_depth)
+            self.stats.update_texture_memory(self.textures.category_stats(), self.textures.leaked)
+            self.hud.draw(self.stats.format_panel())
 
-            sdl2.SDL_RenderPresent(self.sdl_app.renderer)
+            self._present()
 
             self.stats.update_playback_time(current_time)
             self.stats.total_displayed_frames += 1
 
         self._cleanup()
 
+    def _present(self):
+        sdl2.SDL_RenderPresent(self.sdl_app.renderer)
+
+    def _create_cpu_compositor(self, motion=None):
+        self.cpu_compositor = CpuCompositor(
+            self.sdl_app.renderer,
+            self.texture_manager,
+            self.transition_manager._image_rect(),
+            self.config.frames_to_interpolate,
+            motion=motion,
+            weights=self._blend_weights()
+        )
+
     def _initialize(self):
         current_seq = self.config.get_current_sequence()
-        self.overlay_texture = self.texture_manager.load_image(
-            current_seq['overlay_path'],
-            self.config.final_resolution,
-            keep_aspect=True
-        )
+        self._preload_overlays()
+        self._set_overlay(current_seq)
 
         if not self.overlay_texture:
             raise Exception("Failed to create overlay texture")
 
-        self.sequence_player.set_directory(current_seq['image_directory'])
+        self.sequence_player.set_directory(current_seq['image_directory'], self.config.get_resampling(current_seq))
         self.sequence_player.start_loader_thread(self.config.sequence_start_frame)
 
         while self.sequence_player.frame_buffer.empty():
             time.sleep(0.1)
 
-        _, self.current_texture = self.sequence_player.frame_buffer.get()
-        self.last_full_frame_texture = self.current_texture
+        self._take_first_frame()
 
     def _handle_fade_transition(self, current_time):
-        if not self.fade_textures:
+        if not self.fade_base:
             self.is_fading = False
             return
 
+        if self.fade_start_time is None:
+            self.fade_start_time = current_time
         progress = (current_time - self.fade_start_time) / self.config.fade_duration
-        frame_index = min(int(progress * len(self.fade_textures)), len(self.fade_textures) - 1)
-
-        if frame_index < len(self.fade_textures):
-            sdl2.SDL_RenderCopy(self.sdl_app.renderer, self.fade_textures[frame_index], None, None)
+        self._render_fade(progress)
 
         if progress >= 1.0:
             self.is_fading = False
-            self._cleanup_fade_textures()
+            self._cleanup_fade()
 
             if self.video_mode_started:
                 self.video_mode_started = False
-                self.stats = PlaybackStatistics()
+                self.stats = PlaybackStatistics(current_time)
+                # The white screen kept for the sequence reset is not needed any more
+                if self.white_transition:
+                    self.texture_manager.release_texture(self.white_transition)
+                    self.white_transition = None
             else:
                 current_seq = self.config.get_current_sequence()
                 self.fade_completed = True
                 self._cleanup_image_resources()
+                if self.config.next_sequence_prefetch:
+                    self.next_sequence_player = self._start_sequence_player(
+                        self.config.peek_next_sequence(),
+                        self.config.next_sequence_prefetch
+                    )
+                self._preload_overlays()
                 self.white_transition = self.transition_manager.create_white_transition_texture()
-                self.video_player = VideoPlayer(current_seq['video_path'], self.sdl_app.renderer)
+                if not self.video_player:
+                    self._preroll_video(current_seq)
+                self.video_due_time = current_time
                 self.video_mode_started = True
 
-    def _cleanup_fade_textures(self):
-        if self.fade_textures:
-            for texture in self.fade_textures:
-                sdl2.SDL_DestroyTexture(texture)
-            self.fade_textures = None
+    def _preroll_video(self, sequence):
+        """Open and start decoding the sequence's video so it is ready when the fade ends"""
+        self.video_player = VideoPlayer(
+            sequence['video_path'],
+            self.sdl_app.renderer,
+            self.texture_manager,
+            self.config.video_queue_size
+        )
+
+    def _create_fade_base(self, texture):
+        if self.cpu_compositor:
+            return self.cpu_compositor.current_texture
+        return self.transition_manager.create_fade_base(texture, self.overlay_texture)
+
+    def _render_fade(self, progress):
+        if self.cpu_compositor:
+            self.cpu_compositor.render_fade(
+                self.transition_manager.fade_alpha(progress, self.fade_to_white),
+                self.transition_manager.white_rows()
+            )
+        else:
+            self.transition_manager.render_fade(self.fade_base, progress, self.fade_to_white)
+
+    def _cleanup_fade(self):
+        if self.fade_base and not self.cpu_compositor:
+            self.texture_manager.release_texture(self.fade_base)
+        self.fade_base = None
 
-    def _handle_white_transition(self):
+    def _handle_white_transition(self, current_time):
         sdl2.SDL_RenderClear(self.sdl_app.renderer)
         sdl2.SDL_RenderCopy(
             self.sdl_app.renderer,
@@ -158,18 +288,36 @@ class Application:
         )
 
         if self.video_player and self.video_player.texture is None:
-            print("Getting first video frame")
-            self.video_player.texture = self.video_player.get_next_frame_texture()
-            if self.video_player.texture:
-                print("Successfully got first video frame")
-                sdl2.SDL_DestroyTexture(self.white_transition)
+            if self.video_player.update(current_time, self.decode_wait):
+                self._record_video_frame()
+                wait_time = current_time - self.video_due_time
+                self.stats.record_video_start(wait_time, self.video_player.first_decode_time)
+                print(
+                    f"First video frame {wait_time * 1000:.1f} ms after fade end "
+                    f"(first decode {self.video_player.first_decode_time * 1000:.1f} ms after pre-roll start)"
+                )
+                self.texture_manager.release_texture(self.white_transition)
                 self.white_transition = None
+            elif self.video_player.video_finished:
+                # The video could not be opened or had no frames; move on to the next sequence
+                self.texture_manager.release_texture(self.white_transition)
+                self.white_transition = None
+
+    def _handle_video_playback(self, current_time):
+        if self.video_player.update(current_time, self.decode_wait):
+            self._record_video_frame()
+        self.overlay_cache.poll()
+        self.stats.update_video_queue(
+            self.video_player.queue_depth(),
+            self.video_player.underruns,
+            self.video_player.dropped_frames,
+            self.video_player.drift
+        )
 
-    def _handle_video_playback(self):
         if self.video_player.video_finished:
             if True:
                 last_white = self._cleanup_video()
-                self._reset_sequence_with_transition(last_white)
+                self._reset_sequence_with_transition(last_white, current_time)
                 return
 
         if self.video_player.texture:
@@ -182,9 +330,8 @@ class Application:
             if ret != 0:
                 print(f"SDL_RenderCopy failed: {sdl2.SDL_GetError()}")
 
-            old_texture = self.video_player.texture
-            self.video_player.texture = self.video_player.get_next_frame_texture()
-            sdl2.SDL_DestroyTexture(old_texture)
+    def _record_video_frame(self):
+        self.metrics.record_video_frame(self.video_player.last_decode_time, self.video_player.last_upload_time)
 
     def _render_white_screen(self):
         sdl2.SDL_SetRenderDrawColor(self.sdl_app.renderer, 0, 0, 0, 255)
@@ -197,53 +344,86 @@ class Application:
         white_transition = self.transition_manager.create_white_transition_texture()
     
         if self.video_player:
-            self.video_player.video_finished = True
+            self.video_player.close()
             self.video_player = None
         if self.white_transition:
-            sdl2.SDL_DestroyTexture(self.white_transition)
+            self.texture_manager.release_texture(self.white_transition)
 
         # Switch to next sequence
         next_seq = self.config.next_sequence()
 
         return white_transition
 
-    def _reset_sequence_with_transition(self, white_transition):
+    def _reset_sequence_with_transition(self, white_transition, current_time):
         current_seq = self.config.get_current_sequence()
 
-        # Update overlay
-        if self.overlay_texture:
-            sdl2.SDL_DestroyTexture(self.overlay_texture)
-        self.overlay_texture = self.texture_manager.load_image(
-            current_seq['overlay_path'],
-            self.config.final_resolution,
-            keep_aspect=True
-        )
+        # Update overlay, normally already resident in the overlay cache
+        self._set_overlay(current_seq)
 
         self.white_transition = white_transition
         self.fade_completed = False
         self.frame_in_sequence = 0
 
-        self.sequence_player = ImageSequencePlayer(self.config, self.texture_manager)
-        self.sequence_player.set_directory(current_seq['image_directory'])
-        self.sequence_player.start_loader_thread(self.config.sequence_start_frame)
+        if self.memory_cache:
+            print(f"Memory frame cache: {self.memory_cache.format_stats()}")
+        self._check_texture_leaks()
 
-        self._render_white_screen()
+        self.sequence_player.stop()
+        if self.next_sequence_player:
+            self.sequence_player = self.next_sequence_player
+            self.sequence_player.set_prefetch_limit(None)
+            self.next_sequence_player = None
+        else:
+            self.sequence_player = self._start_sequence_player(current_seq)
 
+        # Only waits when nothing could be prefetched during the video
         while self.sequence_player.frame_buffer.empty():
             self._render_white_screen()
             time.sleep(0.1)
 
-        _, self.current_texture = self.sequence_player.frame_buffer.get()
-        self.last_full_frame_texture = self.current_texture
-        self.fade_textures = self.transition_manager.create_fade_from_white(
-            self.current_texture,
-            self.overlay_texture
-        )
+        self._take_first_frame()
+        self.fade_base = self._create_fade_base(self.current_texture)
+        self.fade_to_white = False
         self.is_fading = True
-        self.fade_start_time = time.time()
+        # Started by the first tick after the wait, so a slow first decode does not eat into the fade
+        self.fade_start_time = None
+        self._render_fade(0.0)
+
+        # The wait above is intentional, not a pacing failure: start a new run of deadlines
+        self.scheduler.reset()
+        self.last_tick_time = None
+
+    def _check_texture_leaks(self):
+        leaks = self.textures.check_leaks()
+        print(f"Textures: {self.textures.format_stats()}")
+        print(f"Texture pool: {self.texture_manager.format_pool_stats()}")
+        if leaks:
+            print(f"{len(leaks)} texture(s) leaked during the last sequence")
+            if self.textures.debug:
+                for record in leaks:
+                    print(self.textures.format_record(record))
+
+    def _set_overlay(self, sequence):
+        self.overlay_texture = self.overlay_cache.get(sequence['overlay_path'])
+        self.overlay_tiles = self.overlay_cache.tiles(sequence['overlay_path'])
+        if self.cpu_compositor:
+            self.cpu_compositor.set_overlay(self.overlay_cache.image(sequence['overlay_path']))
+
+    def _preload_overlays(self):
+        """Decode overlays that are missing or changed on disk in the background"""
+        self.overlay_cache.preload(sequence['overlay_path'] for sequence in self.config.sequences)
+
+    def _start_sequence_player(self, sequence, prefetch_limit=None):
+        """Create a player for sequence and start loading it from the configured start frame"""
+        player = ImageSequencePlayer(
+            self.config, self.texture_manager, self.frame_decoder, self.frame_cache, self.memory_cache,
+            prefetch_limit
+        )
+        player.set_directory(sequence['image_directory'], self.config.get_resampling(sequence))
+        player.start_loader_thread(self.config.sequence_start_frame)
+        return player
 
-    def _handle_image_sequence(self):
-        current_time = time.time()
+    def _handle_image_sequence(self, current_time):
         current_frame_rendered = False
 
         # Check if we should start fade first
@@ -254,21 +434,24 @@ class Application:
             self._render_frame_with_overlay(self.last_full_frame_texture)
             current_frame_rendered = True
             # Then prepare fade using that same frame
-            self.fade_textures = self.transition_manager.create_fade_to_white(
-                self.last_full_frame_texture,
-                self.overlay_texture
-            )
+            self.fade_base = self._create_fade_base(self.last_full_frame_texture)
+            self.fade_to_white = True
             self.is_fading = True
             self.fade_start_time = current_time
+            self._preroll_video(self.config.get_current_sequence())
             return
 
         if not current_frame_rendered:
-            if self.frame_in_sequence == 0:
-                if not self.sequence_player.frame_buffer.empty():
+            if self.cpu_compositor:
+                self._present_composited(current_time)
+            elif self.config.interpolation_mode == 'present':
+                self._present_crossfade(current_time)
+            elif self.frame_in_sequence == 0:
+                if self._frame_available():
                     if not self.stats.playing:
-                        self.stats.start_playback()
+                        self.stats.start_playback(current_time)
 
-                    next_index, self.next_texture = self.sequence_player.frame_buffer.get()
+                    next_index, self.next_texture = self._take_next_frame()
                     self._cleanup_interpolated_frames()
 
                     for i in range(self.config.frames_to_interpolate):
@@ -284,7 +467,7 @@ class Application:
                 else:
                     self._render_frame_with_overlay(self.last_full_frame_texture)
                     if self.stats.playing:
-                        self.stats.pause_playback()
+                        self.stats.pause_playback(current_time)
             else:
                 if self.frame_in_sequence <= self.config.frames_to_interpolate:
                     interp_index = self.frame_in_sequence - 1
@@ -293,24 +476,161 @@ class Application:
                     self.frame_in_sequence += 1
                 else:
                     self._render_frame_with_overlay(self.next_texture)
-                    if self.last_full_frame_texture and self.last_full_frame_texture != self.current_texture:
-                        sdl2.SDL_DestroyTexture(self.last_full_frame_texture)
+                    self.texture_manager.release_frame(self.current_texture)
                     self.last_full_frame_texture = self.next_texture
                     self.current_texture = self.next_texture
                     self.next_texture = None
                     self.frame_in_sequence = 0
 
+    def _present_composited(self, current_time):
+        """Show CPU-composited frames: the source frame, then the batched blends toward the next one"""
+        if self.cpu_compositor.motion:
+            self._feed_motion()
+
+        if self.frame_in_sequence == 0:
+            if not (self._motion_frame_ready() if self.cpu_compositor.motion else self._frame_available()):
+                self.cpu_compositor.draw(0)
+                if self.stats.playing:
+                    self.stats.pause_playback(current_time)
+                return
+
+            if not self.stats.playing:
+                self.stats.start_playback(current_time)
+
+            if self.cpu_compositor.motion:
+                self.cpu_compositor.take_prepared()
+            else:
+                self._take_next_frame()
+                self.cpu_compositor.interpolate(self._blend_weights())
+            self.stats.total_source_frames += 1
+
+        self.cpu_compositor.draw(self.frame_in_sequence)
+        self.frame_in_sequence += 1
+        if self.frame_in_sequence > self.config.frames_to_interpolate:
+            self.cpu_compositor.promote()
+            self.frame_in_sequence = 0
+
+    def _blend_weights(self):
+        # Eased in both modes, like the GPU crossfade and _interpolate_textures; motion
+        # interpolation moves blocks linearly and eases only these weights
+        steps = self.config.frames_to_interpolate + 1
+        return [self._ease_in_out_quad(i / steps) for i in range(1, steps)]
+
+    def _present_crossfade(self, current_time):
+        """Blend current and next source frames straight onto the backbuffer for this tick"""
+        duration = self.config.crossfade_duration
+        promoted = False
+        if self.next_texture is not None and current_time - self.crossfade_start_time >= duration:
+            # Crossfade finished: next becomes current and the following crossfade starts this tick
+            self.texture_manager.release_frame(self.current_texture)
+            self.last_full_frame_texture = self.next_texture
+            self.current_texture = self.next_texture
+            self.next_texture = None
+            self.crossfade_start_time += duration
+            promoted = True
+
+        if self.next_texture is None:
+            if not self._frame_available():
+                self._render_frame_with_overlay(self.last_full_frame_texture)
+                if self.stats.playing:
+                    self.stats.pause_playback(current_time)
+                return
+
+            if not self.stats.playing:
+                self.stats.start_playback(current_time)
+
+            _, self.next_texture = self._take_next_frame()
+            # Keep the cadence tied to the source rate, unless playback was held or fell a crossfade behind
+            if not promoted or current_time - self.crossfade_start_time >= duration:
+                self.crossfade_start_time = current_time
+            self.stats.total_source_frames += 1
+            self.last_full_frame_texture = self.current_texture
+
+        progress = (current_time - self.crossfade_start_time) / duration
+        self._render_crossfade_with_overlay(
+            self.current_texture,
+            self.next_texture,
+            self._ease_in_out_quad(max(0.0, progress))
+        )
+
+    def _frame_available(self):
+        """True if a decoded source frame is buffered, first waiting up to decode_wait seconds if set"""
+        if self.decode_wait and self.sequence_player.frame_buffer.empty():
+            deadline = time.perf_counter() + self.decode_wait
+            while self.sequence_player.frame_buffer.empty() and time.perf_counter() < deadline:
+                time.sleep(0.002)
+        return not self.sequence_player.frame_buffer.empty()
+
+    def _feed_motion(self):
+        """Hand every buffered source frame the motion worker has room for to it"""
+        while self.cpu_compositor.accepts_frame() and not self.sequence_player.frame_buffer.empty():
+            self._take_next_frame()
+
+    def _motion_frame_ready(self):
+        """True if the motion worker has prepared the next frame, first waiting up to decode_wait seconds if set"""
+        if self.decode_wait and not self.cpu_compositor.prepared_ready():
+            deadline = time.perf_counter() + self.decode_wait
+            while not self.cpu_compositor.prepared_ready() and time.perf_counter() < deadline:
+                self._feed_motion()
+                time.sleep(0.002)
+        return self.cpu_compositor.prepared_ready()
+
+    def _take_next_frame(self):
+        """Take the next source frame: into a ring texture, or into the CPU compositor's next frame"""
+        start = time.perf_counter()
+        if self.cpu_compositor:
+            index = self.sequence_player.next_frame_pixels(self.cpu_compositor.load_next)
+            texture = None
+        else:
+            index, texture = self.sequence_player.next_frame()
+        self.stats.record_decode_time(self.sequence_player.last_decode_time)
+        self.metrics.record_source_frame(self.sequence_player.last_decode_time, time.perf_counter() - start)
+        return index, texture
+
+    def _take_first_frame(self):
+        _, self.current_texture = self._take_next_frame()
+        self.last_full_frame_texture = self.current_texture
+        if self.cpu_compositor and self.cpu_compositor.motion:
+            self.cpu_compositor.take_prepared()
+            self.cpu_compositor.promote()
+        elif self.cpu_compositor:
+            self.cpu_compositor.interpolate([])
+            self.cpu_compositor.promote()
+
     def _render_frame_with_overlay(self, texture):
+        if self.cpu_compositor:
+            self.cpu_compositor.draw(0)
+            return
         sdl2.SDL_RenderCopy(self.sdl_app.renderer, texture, None, self.dest_rect)
-        sdl2.SDL_RenderCopy(self.sdl_app.renderer, self.overlay_texture, None, None)
+        self._render_overlay()
+
+    def _render_overlay(self):
+        if not self.overlay_tiles:
+            sdl2.SDL_RenderCopy(self.sdl_app.renderer, self.overlay_texture, None, None)
+            return
+
+        self.overlay_tiles.draw(self.sdl_app.renderer, self.overlay_texture)
+        self.stats.record_overlay_draw(
+            self.overlay_tiles.transparent_pixels,
+            self.overlay_tiles.opaque_pixels,
+            self.overlay_tiles.total_pixels
+        )
+
+    def _render_crossfade_with_overlay(self, texture1, texture2, alpha):
+        sdl2.SDL_RenderCopy(self.sdl_app.renderer, texture1, None, self.dest_rect)
+
+        sdl2.SDL_SetTextureBlendMode(texture2, sdl2.SDL_BLENDMODE_BLEND)
+        sdl2.SDL_SetTextureAlphaMod(texture2, int(alpha * 255))
+        sdl2.SDL_RenderCopy(self.sdl_app.renderer, texture2, None, self.dest_rect)
+        sdl2.SDL_SetTextureAlphaMod(texture2, 255)
+
+        self._render_overlay()
 
     def _interpolate_textures(self, texture1, texture2, alpha):
-        target = sdl2.SDL_CreateTexture(
-            self.sdl_app.renderer,
-            sdl2.SDL_PIXELFORMAT_RGBA8888,
-            sdl2.SDL_TEXTUREACCESS_TARGET,
+        target = self.texture_manager.acquire_texture(
             self.config.final_resolution_model[0],
-            self.config.final_resolution_model[1]
+            self.config.final_resolution_model[1],
+            category='interpolated'
         )
 
         if not target:
@@ -338,35 +658,45 @@ class Application:
 
     def _cleanup_interpolated_frames(self):
         for texture in self.interpolated_frames:
-            sdl2.SDL_DestroyTexture(texture)
+            self.texture_manager.release_texture(texture)
         self.interpolated_frames = []
 
     def _cleanup_image_resources(self):
-        if self.current_texture:
-            sdl2.SDL_DestroyTexture(self.current_texture)
-            self.current_texture = None
-        if self.next_texture:
-            sdl2.SDL_DestroyTexture(self.next_texture)
-            self.next_texture = None
-        if self.last_full_frame_texture:
-            sdl2.SDL_DestroyTexture(self.last_full_frame_texture)
-            self.last_full_frame_texture = None
+        for texture in (self.current_texture, self.next_texture, self.last_full_frame_texture):
+            self.texture_manager.release_frame(texture)
+        self.current_texture = None
+        self.next_texture = None
+        self.last_full_frame_texture = None
         self._cleanup_interpolated_frames()
-        while not self.sequence_player.frame_buffer.empty():
-            _, texture = self.sequence_player.frame_buffer.get()
-            sdl2.SDL_DestroyTexture(texture)
+        self.sequence_player.stop()
 
     def _cleanup(self):
         if self.video_player:
-            self.video_player.video_finished = True
+            self.video_player.close()
         if self.white_transition:
-            sdl2.SDL_DestroyTexture(self.white_transition)
-        if self.fade_textures:
-            for texture in self.fade_textures:
-                sdl2.SDL_DestroyTexture(texture)
+            self.texture_manager.release_texture(self.white_transition)
+        self._cleanup_fade()
         self._cleanup_image_resources()
-        if self.overlay_texture:
-            sdl2.SDL_DestroyTexture(self.overlay_texture)
+        if self.cpu_compositor:
+            self.cpu_compositor.destroy()
+        self.overlay_cache.destroy()
+        self.overlay_texture = None
+        self.overlay_tiles = None
+        self.sequence_player.stop()
+        if self.next_sequence_player:
+            self.next_sequence_player.stop()
+        self.frame_decoder.shutdown()
+        if self.metrics_server:
+            self.metrics_server.stop()
+        if self.metrics_sink:
+            self.metrics_sink.stop()
+        self.texture_manager.destroy_frame_ring()
+        self.texture_manager.destroy_pool()
+
+        if self.textures.debug:
+            # Only the HUD's glyph atlas should outlive the cleanup
+            for record in self.textures.live_records(exclude=('hud',)):
+                print(f"Texture not destroyed at exit: {self.textures.format_record(record)}")
 
 def main(monitor_index):
     try:
@@ -377,9 +707,23 @@ def main(monitor_index):
         sys.exit(1)
 
 if __name__ == "__main__":
+    if '--benchmark' in sys.argv[1:]:
+        from benchmark import benchmark_main
+        benchmark_main([arg for arg in sys.argv[1:] if arg != '--benchmark'])
+        sys.exit(0)
+    if '--export' in sys.argv[1:]:
+        from export import export_main
+        export_main([arg for arg in sys.argv[1:] if arg != '--export'])
+        sys.exit(0)
+
     parser = argparse.ArgumentParser(description='Video player with monitor selection')
     parser.add_argument('--monitor', type=int, default=1,
                       help='Monitor index (0 is usually the main display)')
+    parser.add_argument('--benchmark', action='store_true',
+                      help='Run headless against synthetic frames and print a JSON report '
+                           '(see --benchmark --help)')
+    parser.add_argument('--export', action='store_true',
+                      help='Render the show offline to a video or PNG sequence (see --export --help)')
     args = parser.parse_args()
 
     main(args.monitor)
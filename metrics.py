@@ -0,0 +1,204 @@
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread, Event
+import numpy as np
+
+QUANTILES = (0.5, 0.95, 0.99, 1.0)
+
+class RollingHistogram:
+    """The last window observations of one value, bucketed only when read"""
+    def __init__(self, name, help, buckets, window=1024):
+        self.name = name
+        self.help = help
+        self.buckets = np.asarray(buckets, dtype=np.float64)
+        self.values = np.zeros(window, dtype=np.float64)
+        self.window = window
+        self.count = 0  # observations since start
+
+    def observe(self, value):
+        # No locks or allocation, cheap enough for the render thread; a read racing it may lose one old sample
+        self.values[self.count % self.window] = value
+        self.count += 1
+
+    def recent(self):
+        """Copy of the observations in the window, oldest first"""
+        count = self.count
+        values = self.values.copy()
+        if count < self.window:
+            return values[:count]
+        start = count % self.window
+        return np.concatenate((values[start:], values[:start]))
+
+    def summary(self):
+        values = self.recent()
+        cumulative = np.searchsorted(np.sort(values), self.buckets, side='right')
+        summary = {
+            'count': int(len(values)),
+            'sum': float(values.sum()),
+            'buckets': {f"{le:g}": int(n) for le, n in zip(self.buckets, cumulative)},
+        }
+        if len(values):
+            for q in QUANTILES:
+                summary[f"p{q * 100:g}"] = float(np.quantile(values, q))
+        return summary
+
+class PlaybackMetrics:
+    """Rolling-window histograms and lifetime counters of playback pacing for the whole run"""
+    def __init__(self, frame_interval, queue_capacity, window=1024, textures=None):
+        # Written from the render thread only, read with prometheus_text or snapshot from any thread
+        frame_buckets = [frame_interval * k for k in (0.5, 0.9, 1.1, 1.5, 2, 3, 5, 10)]
+        self.frame_time = RollingHistogram(
+            'player_frame_time_seconds', 'Time between consecutive display ticks', frame_buckets, window
+        )
+        self.decode_latency = RollingHistogram(
+            'player_decode_latency_seconds', 'Time to decode one source or video frame',
+            (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5), window
+        )
+        self.upload_latency = RollingHistogram(
+            'player_upload_latency_seconds', 'Time to hand one decoded source or video frame to the renderer',
+            (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25), window
+        )
+        self.queue_depth = RollingHistogram(
+            'player_queue_depth_frames', 'Decoded source or video frames buffered at each display tick',
+            range(queue_capacity + 1), window
+        )
+        self.histograms = (self.frame_time, self.decode_latency, self.upload_latency, self.queue_depth)
+        self.late_frames = 0
+        self.dropped_frames = 0
+        self.source_frames = 0
+        self.textures = textures
+        self.started = time.time()
+
+    def record_frame_timing(self, late, dropped):
+        if late:
+            self.late_frames += 1
+        self.dropped_frames += dropped
+
+    def record_source_frame(self, decode_seconds, upload_seconds):
+        self.source_frames += 1
+        self.decode_latency.observe(decode_seconds)
+        self.upload_latency.observe(upload_seconds)
+
+    def record_video_frame(self, decode_seconds, upload_seconds):
+        self.decode_latency.observe(decode_seconds)
+        self.upload_latency.observe(upload_seconds)
+
+    def counters(self):
+        counters = {
+            'player_late_frames_total': ('Display ticks that woke past their deadline', self.late_frames),
+            'player_dropped_frames_total': ('Display deadlines skipped entirely', self.dropped_frames),
+            'player_source_frames_total': ('Source frames taken for display', self.source_frames),
+        }
+        if self.textures:
+            counters['player_textures_leaked_total'] = (
+                'Textures still alive a full sequence after they were created', self.textures.leaked
+            )
+        return counters
+
+    def texture_bytes(self):
+        """Live texture bytes per category, empty without a TextureRegistry"""
+        if not self.textures:
+            return {}
+        return {category: entry['bytes'] for category, entry in self.textures.snapshot()['categories'].items()}
+
+    def prometheus_text(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for name, (help, value) in self.counters().items():
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} counter", f"{name} {value}"]
+
+        if self.textures:
+            lines += [
+                "# HELP player_texture_bytes Approximate video memory of live textures per category",
+                "# TYPE player_texture_bytes gauge",
+            ]
+            lines += [
+                f'player_texture_bytes{{category="{category}"}} {nbytes}'
+                for category, nbytes in self.texture_bytes().items()
+            ]
+
+        # Window histograms go down as well as up, so they are gauges: <name>{quantile}, _bucket, _count and _sum
+        for histogram in self.histograms:
+            summary = histogram.summary()
+            name = histogram.name
+            lines += [
+                f"# HELP {name} {histogram.help}, over the last {histogram.window} observations",
+                f"# TYPE {name} gauge",
+            ]
+            for q in QUANTILES:
+                if f"p{q * 100:g}" in summary:
+                    lines.append(f'{name}{{quantile="{q:g}"}} {summary[f"p{q * 100:g}"]:.6g}')
+            lines += [f"# TYPE {name}_bucket gauge"]
+            lines += [f'{name}_bucket{{le="{le}"}} {n}' for le, n in summary['buckets'].items()]
+            lines += [
+                f'{name}_bucket{{le="+Inf"}} {summary["count"]}',
+                f"# TYPE {name}_count gauge",
+                f"{name}_count {summary['count']}",
+                f"# TYPE {name}_sum gauge",
+                f"{name}_sum {summary['sum']:.6g}",
+            ]
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """All metrics as a plain dict, e.g. for one JSON line"""
+        snapshot = {'time': time.time(), 'uptime': time.time() - self.started}
+        snapshot.update({name: value for name, (_, value) in self.counters().items()})
+        if self.textures:
+            snapshot['player_texture_bytes'] = self.texture_bytes()
+        snapshot.update({histogram.name: histogram.summary() for histogram in self.histograms})
+        return snapshot
+
+class MetricsServer:
+    """Serves PlaybackMetrics at /metrics over HTTP from a background thread"""
+    def __init__(self, metrics, port, host='127.0.0.1'):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = Thread(target=self.server.serve_forever, daemon=True, name='metrics-http')
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+class JsonLinesSink:
+    """Appends a PlaybackMetrics snapshot to a file as one JSON line every interval seconds"""
+    def __init__(self, metrics, path, interval=10.0):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self.stop_event = Event()
+        self.thread = Thread(target=self._run, daemon=True, name='metrics-jsonl')
+        self.thread.start()
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            self.write()
+
+    def write(self):
+        try:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(self.metrics.snapshot()) + '\n')
+        except OSError as e:
+            print(f"Failed to write metrics to {self.path}: {e}")
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+        self.write()
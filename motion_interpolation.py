@@ -0,0 +1,172 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+class MotionInterpolator:
+    """Block motion estimation and motion-compensated blending of RGBA frames"""
+    def __init__(self, size, block_size=32, scale=4, search=4, workers=2):
+        self.width, self.height = size
+        self.block_size = block_size
+        self.scale = scale
+        self.search = search
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='motion')
+        self.workers = max(1, workers)
+
+        coarse_block = max(1, block_size // scale)
+        self.coarse_block = coarse_block
+        self.block_rows = max(1, self.height // block_size)
+        self.block_cols = max(1, self.width // block_size)
+        self.offsets = [(dy, dx) for dy in range(-search, search + 1) for dx in range(-search, search + 1)]
+        self.costs = np.zeros((len(self.offsets), self.block_rows, self.block_cols), dtype=np.int32)
+
+        # Refinement offsets around the coarse winner, no refinement first so it wins ties
+        r = scale // 2
+        self.refinements = sorted(
+            ((dy, dx) for dy in range(-r, r + 1) for dx in range(-r, r + 1)), key=lambda o: (o != (0, 0))
+        )
+        self.refine_costs = np.zeros((len(self.refinements), self.block_rows, self.block_cols), dtype=np.int32)
+        # Full-resolution sample grid: rows (block_rows, k, 1, 1) and columns (1, 1, block_cols, k)
+        samples = np.arange(0, block_size, scale)
+        self.sample_rows = (np.arange(self.block_rows)[:, None] * block_size + samples)[:, :, None, None]
+        self.sample_cols = (np.arange(self.block_cols)[:, None] * block_size + samples)[None, None, :, :]
+
+        # Pixel extent of each block; the last row and column of blocks absorb any remainder
+        starts_y = np.arange(self.block_rows) * block_size
+        starts_x = np.arange(self.block_cols) * block_size
+        ends_y = np.append(starts_y[1:], self.height)
+        ends_x = np.append(starts_x[1:], self.width)
+        self.block_bounds = (starts_y[:, None], ends_y[:, None], starts_x[None, :], ends_x[None, :])
+        self.block_of_row = np.minimum(np.arange(self.height) // block_size, self.block_rows - 1)
+        self.block_of_col = np.minimum(np.arange(self.width) // block_size, self.block_cols - 1)
+        self.pixel_index = np.arange(self.height * self.width, dtype=np.int32).reshape(self.height, self.width)
+
+        self.last_vectors = np.zeros((self.block_rows, self.block_cols, 2), dtype=np.int32)
+
+    def _luma(self, frame):
+        """Luma of an RGBA frame, average-pooled over scale x scale pixels, as int16"""
+        s = self.scale
+        h = self.block_rows * self.coarse_block
+        w = self.block_cols * self.coarse_block
+        region = frame[:h * s, :w * s]
+        luma = region[..., 0].astype(np.uint16)
+        luma += region[..., 1]
+        luma += region[..., 1]
+        luma += region[..., 2]
+        pooled = luma.reshape(h, s, w, s).sum(axis=(1, 3), dtype=np.uint32)
+        return (pooled // (4 * s * s)).astype(np.int16)
+
+    def _full_luma(self, frame):
+        """Luma of an RGBA frame at full resolution, as int16"""
+        luma = frame[..., 0].astype(np.int16)
+        luma += frame[..., 1]
+        luma += frame[..., 1]
+        luma += frame[..., 2]
+        luma >>= 2
+        return luma
+
+    def _score(self, current, padded, indices):
+        r = self.search
+        h, w = current.shape
+        b = self.coarse_block
+        for i in indices:
+            dy, dx = self.offsets[i]
+            shifted = padded[r + dy:r + dy + h, r + dx:r + dx + w]
+            difference = np.abs(current - shifted)
+            self.costs[i] = difference.reshape(self.block_rows, b, self.block_cols, b).sum(axis=(1, 3))
+
+    def estimate(self, current, next):
+        """Motion vectors (block_rows, block_cols, 2) in pixels, (dy, dx) from current to next"""
+        # Exhaustive block matching by sum of absolute differences on luma downscaled by scale,
+        # every candidate offset scored for all blocks at once; NumPy releases the GIL in the workers
+        coarse_current = self._luma(current)
+        padded = np.pad(self._luma(next), self.search, mode='edge')
+
+        chunks = np.array_split(np.arange(len(self.offsets)), self.workers)
+        for future in [self.executor.submit(self._score, coarse_current, padded, chunk) for chunk in chunks]:
+            future.result()
+
+        # Zero motion gets a small bonus so flat areas stay put
+        zero = self.offsets.index((0, 0))
+        self.costs[zero] -= self.costs[zero] >> 4
+        best = self.costs.argmin(axis=0)
+        offsets = np.array(self.offsets, dtype=np.int32) * self.scale
+        self.last_vectors = self._refine(current, next, offsets[best])
+        return self.last_vectors
+
+    def _score_refinements(self, current_samples, next_luma, vectors, indices):
+        rows = self.sample_rows + vectors[:, None, :, None, 0]
+        cols = self.sample_cols + vectors[:, None, :, None, 1]
+        for i in indices:
+            dy, dx = self.refinements[i]
+            shifted = next_luma[np.clip(rows + dy, 0, self.height - 1), np.clip(cols + dx, 0, self.width - 1)]
+            self.refine_costs[i] = np.abs(current_samples - shifted).sum(axis=(1, 3))
+
+    def _refine(self, current, next, vectors):
+        """Coarse vectors moved to the best full-resolution offset within scale // 2 pixels"""
+        if len(self.refinements) == 1:
+            return vectors
+        current_samples = self._full_luma(current[self.sample_rows, self.sample_cols])
+        next_luma = self._full_luma(next)
+
+        chunks = np.array_split(np.arange(len(self.refinements)), self.workers)
+        futures = [
+            self.executor.submit(self._score_refinements, current_samples, next_luma, vectors, chunk)
+            for chunk in chunks
+        ]
+        for future in futures:
+            future.result()
+
+        best = self.refine_costs.argmin(axis=0)
+        return vectors + np.array(self.refinements, dtype=np.int32)[best]
+
+    def _block_offsets(self, vectors):
+        """Flat index offsets per block, clipped so every moved block stays inside the frame"""
+        y0, y1, x0, x1 = self.block_bounds
+        dy = np.clip(vectors[..., 0], -y0, self.height - y1)
+        dx = np.clip(vectors[..., 1], -x0, self.width - x1)
+        return (dy * self.width + dx).astype(np.int32)
+
+    def _moved(self, frame, offsets, start, end):
+        """Rows start to end of frame with every block moved by its flat index offset"""
+        index = self.pixel_index[start:end] + offsets[self.block_of_row[start:end, None], self.block_of_col[None, :]]
+        pixels = frame.view(np.uint32).reshape(-1).take(index)
+        return pixels.view(np.uint8).reshape(end - start, self.width, 4)
+
+    def _blend_rows(self, current, next, current_offsets, next_offsets, weight, out, start, end):
+        if current_offsets is None:
+            a, b = current[start:end], next[start:end]
+        else:
+            a = self._moved(current, current_offsets, start, end)
+            b = self._moved(next, next_offsets, start, end)
+        blended = np.subtract(b, a, dtype=np.int16)
+        blended *= weight
+        blended += 64
+        blended >>= 7
+        blended += a
+        np.copyto(out[start:end], blended, casting='unsafe')
+
+    def blend(self, current, next, vectors, t, out, weight=None):
+        """Write the frame at time t (0-1) between current and next into out, crossfading in place without vectors"""
+        # weight (default t) only eases the blend, blocks always move linearly with t
+        weight = round((t if weight is None else weight) * 128)
+        if vectors is None:
+            current_offsets = next_offsets = None
+        else:
+            # Each block comes from current moved t of the way and from next moved back the rest
+            moved = np.rint(vectors * t).astype(np.int32)
+            current_offsets = self._block_offsets(-moved)
+            next_offsets = self._block_offsets(vectors - moved)
+
+        # Bands of one block row keep the temporaries small enough to stay in cache
+        futures = [
+            self.executor.submit(
+                self._blend_rows, current, next, current_offsets, next_offsets, weight, out,
+                start, min(start + self.block_size, self.height)
+            )
+            for start in range(0, self.height, self.block_size)
+        ]
+        for future in futures:
+            future.result()
+        return out
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
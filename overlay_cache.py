@@ -0,0 +1,185 @@
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import sdl2
+from frame_decoder import prepare_image
+
+TRANSPARENT, OPAQUE, MIXED = 0, 1, 2
+
+class OverlayTiles:
+    """An overlay's alpha channel classified once into transparent, opaque and mixed tiles"""
+    def __init__(self, alpha, tile_size=128):
+        height, width = alpha.shape
+        rows = -(-height // tile_size)
+        cols = -(-width // tile_size)
+        pad = ((0, rows * tile_size - height), (0, cols * tile_size - width))
+        low = np.pad(alpha, pad, constant_values=255).reshape(rows, tile_size, cols, tile_size).min(axis=(1, 3))
+        high = np.pad(alpha, pad, constant_values=0).reshape(rows, tile_size, cols, tile_size).max(axis=(1, 3))
+        classes = np.full((rows, cols), MIXED, dtype=np.uint8)
+        classes[high == 0] = TRANSPARENT
+        classes[low == 255] = OPAQUE
+
+        self.total_pixels = width * height
+        self.opaque_rects = []
+        self.blended_rects = []
+        self.transparent_pixels = 0
+        self.opaque_pixels = 0
+
+        # Runs of one class in a tile row merge into one rect: transparent ones are skipped,
+        # opaque ones copied without blending and only mixed ones alpha-blended
+        for row in range(rows):
+            y = row * tile_size
+            h = min(tile_size, height - y)
+            col = 0
+            while col < cols:
+                kind = classes[row, col]
+                end = col + 1
+                while end < cols and classes[row, end] == kind:
+                    end += 1
+                x = col * tile_size
+                w = min(end * tile_size, width) - x
+                if kind == TRANSPARENT:
+                    self.transparent_pixels += w * h
+                elif kind == OPAQUE:
+                    self.opaque_rects.append(sdl2.SDL_Rect(x, y, w, h))
+                    self.opaque_pixels += w * h
+                else:
+                    self.blended_rects.append(sdl2.SDL_Rect(x, y, w, h))
+                col = end
+
+    @classmethod
+    def from_image(cls, image, tile_size=128):
+        if image.mode == 'RGBA':
+            alpha = np.asarray(image.getchannel('A'))
+        else:
+            alpha = np.full((image.height, image.width), 255, dtype=np.uint8)
+        return cls(alpha, tile_size)
+
+    def draw(self, renderer, texture):
+        """Draw texture at its own size, which must match the render target's logical size"""
+        sdl2.SDL_SetTextureBlendMode(texture, sdl2.SDL_BLENDMODE_NONE)
+        for rect in self.opaque_rects:
+            sdl2.SDL_RenderCopy(renderer, texture, rect, rect)
+        sdl2.SDL_SetTextureBlendMode(texture, sdl2.SDL_BLENDMODE_BLEND)
+        for rect in self.blended_rects:
+            sdl2.SDL_RenderCopy(renderer, texture, rect, rect)
+
+def _prepare_overlay(path, size, tile_size):
+    image = prepare_image(path, size, True)
+    return image, OverlayTiles.from_image(image, tile_size)
+
+class OverlayCache:
+    """Overlay textures for every sequence, decoded in the background and kept resident"""
+    def __init__(self, texture_manager, size, budget_bytes, workers=2, tile_size=128, keep_images=False):
+        self.texture_manager = texture_manager
+        self.size = size
+        self.budget_bytes = budget_bytes
+        self.tile_size = tile_size
+        self.keep_images = keep_images  # also keep the decoded images, for CPU compositing
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='overlay')
+        # path -> (mtime_ns, texture, bytes, tiles, image), least recently used first; an edited file is decoded again
+        self.textures = OrderedDict()
+        self.pending = {}  # path -> (mtime_ns, future)
+        self.in_use = None  # path of the overlay last returned by get, never evicted or replaced in the background
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _mtime(self, path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def preload(self, paths):
+        """Start decoding every path that is neither resident and current nor already being decoded"""
+        for path in paths:
+            mtime = self._mtime(path)
+            if mtime is None:
+                print(f"File not found: {path}")
+                continue
+            entry = self.textures.get(path)
+            if entry and entry[0] == mtime:
+                continue
+            if path in self.pending and self.pending[path][0] == mtime:
+                continue
+            self.pending[path] = (mtime, self.executor.submit(_prepare_overlay, path, self.size, self.tile_size))
+
+    def poll(self):
+        """Turn at most one finished decode into a texture; call on the render thread"""
+        for path, (mtime, future) in self.pending.items():
+            # A new version of the overlay in use is only swapped in by get
+            if future.done() and path != self.in_use:
+                del self.pending[path]
+                self._upload(path, mtime, future)
+                return
+
+    def get(self, path):
+        """Return the overlay texture for path, decoding it now if it is missing or stale"""
+        self.in_use = path
+        mtime = self._mtime(path)
+        if mtime is None:
+            print(f"File not found: {path}")
+            return None
+
+        entry = self.textures.get(path)
+        if entry and entry[0] == mtime:
+            self.textures.move_to_end(path)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        if path not in self.pending or self.pending[path][0] != mtime:
+            self.preload([path])
+        pending = self.pending.pop(path, None)
+        if pending is None:
+            # The file disappeared after the stat above
+            return None
+        mtime, future = pending
+        return self._upload(path, mtime, future)
+
+    def tiles(self, path):
+        """OverlayTiles of the resident overlay for path, or None if it is not resident"""
+        entry = self.textures.get(path)
+        return entry[3] if entry else None
+
+    def image(self, path):
+        """Decoded PIL image of the resident overlay for path, if keep_images is set"""
+        entry = self.textures.get(path)
+        return entry[4] if entry else None
+
+    def _upload(self, path, mtime, future):
+        try:
+            image, tiles = future.result()
+            texture = self.texture_manager.texture_from_image(image, 'overlay')
+        except Exception as e:
+            print(f"Error loading overlay {path}: {e}")
+            return None
+        if not texture:
+            return None
+
+        self._discard(path)
+        nbytes = self.size[0] * self.size[1] * 4 * (2 if self.keep_images else 1)
+        self.textures[path] = (mtime, texture, nbytes, tiles, image if self.keep_images else None)
+        self.total_bytes += nbytes
+
+        # Evict least recently used overlays down to the budget, except the new and in-use ones
+        while self.total_bytes > self.budget_bytes:
+            victim = next((old for old in self.textures if old not in (path, self.in_use)), None)
+            if victim is None:
+                break
+            self._discard(victim)
+        return texture
+
+    def _discard(self, path):
+        entry = self.textures.pop(path, None)
+        if entry:
+            self.texture_manager.destroy_texture(entry[1])
+            self.total_bytes -= entry[2]
+
+    def destroy(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.pending.clear()
+        for path in list(self.textures):
+            self._discard(path)
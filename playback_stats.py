@@ -1,28 +1,126 @@
 import time
+from collections import deque
 import sdl2
 
 class PlaybackStatistics:
     """Handles playback statistics and display"""
-    def __init__(self):
+    def __init__(self, start_time=None):
         self.playback_time = 0.0
         self.total_source_frames = 1
         self.total_displayed_frames = 1
-        self.last_playback_start = time.time()
+        self.decoded_frames = 0
+        self.total_decode_time = 0.0
+        self.last_decode_time = 0.0
+        self.late_frames = 0
+        self.dropped_frames = 0
+        self.buffer_level = 0
+        self.buffer_capacity = 0
+        self.buffer_bursting = False
+        self.frame_times = deque(maxlen=300)
+        self.video_queue_depth = 0
+        self.video_underruns = 0
+        self.video_dropped_frames = 0
+        self.video_drift = 0.0
+        self.video_start_latency = None
+        self.video_preroll_time = None
+        self.overlay_pixels = 0
+        self.overlay_skipped_pixels = 0
+        self.overlay_unblended_pixels = 0
+        self.texture_categories = []  # (category, live count, live bytes)
+        self.texture_leaks = 0
+        self.last_playback_start = time.perf_counter() if start_time is None else start_time
         self.playing = True
 
-    def format_stats(self):
-        """Format current playback statistics as a string"""
+    def record_frame_time(self, seconds):
+        """Record the time between two consecutive displayed frames"""
+        self.frame_times.append(seconds)
+
+    def frame_time_percentiles(self, percentiles=(50, 95, 99)):
+        """Frame time in seconds at each percentile over the recent frames"""
+        if not self.frame_times:
+            return [0.0 for _ in percentiles]
+        ordered = sorted(self.frame_times)
+        return [ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] for p in percentiles]
+
+    def format_panel(self):
+        """Format current playback statistics as lines for the HUD panel"""
         hours, remainder = divmod(self.playback_time, 3600)
         minutes, seconds = divmod(remainder, 60)
 
         source_fps = self.total_source_frames / max(self.playback_time, 0.001)
         total_fps = self.total_displayed_frames / max(self.playback_time, 0.001)
+        p50, p95, p99 = self.frame_time_percentiles()
+        worst = max(self.frame_times, default=0.0)
+
+        return [
+            f"{int(hours):02}:{int(minutes):02}:{seconds:05.2f}  "
+            f"source {self.total_source_frames} ({source_fps:.1f}/s)  "
+            f"display {self.total_displayed_frames} ({total_fps:.1f}/s)",
+            f"Queue: {self.buffer_level}/{self.buffer_capacity}{' prefetching' if self.buffer_bursting else ''}",
+            f"Decode: {self.last_decode_time * 1000:.1f} ms  avg {self.average_decode_time() * 1000:.1f} ms",
+            f"Frame time: p50 {p50 * 1000:.1f}  p95 {p95 * 1000:.1f}  p99 {p99 * 1000:.1f}  "
+            f"max {worst * 1000:.1f} ms",
+            f"Late: {self.late_frames}  Dropped: {self.dropped_frames}",
+            f"Overlay: skipped {self.overlay_skipped_pixels * 100 / max(self.overlay_pixels, 1):.0f}%  "
+            f"unblended {self.overlay_unblended_pixels * 100 / max(self.overlay_pixels, 1):.0f}%  "
+            f"saved {(self.overlay_skipped_pixels + self.overlay_unblended_pixels) / 1e6:.0f} Mpx",
+            f"Video queue: {self.video_queue_depth}  underruns {self.video_underruns}  "
+            f"dropped {self.video_dropped_frames}  drift {self.video_drift * 1000:+.1f} ms",
+            self._format_texture_memory(),
+        ] + ([
+            f"Video start: {self.video_start_latency * 1000:.1f} ms after fade  "
+            f"pre-roll decode {self.video_preroll_time * 1000:.1f} ms"
+        ] if self.video_start_latency is not None else [])
 
-        return (
-            f"{int(hours):02}:{int(minutes):02}:{seconds:05.2f} | "
-            f"Source frames: {self.total_source_frames} ({source_fps:.1f}/s) | "
-            f"Total frames: {self.total_displayed_frames} ({total_fps:.1f}/s)"
+    def _format_texture_memory(self):
+        total = sum(nbytes for _, _, nbytes in self.texture_categories)
+        categories = "  ".join(
+            f"{category} {count}/{nbytes / 1024 ** 2:.0f}" for category, count, nbytes in self.texture_categories
         )
+        return f"Textures: {total / 1024 ** 2:.0f} MB  {categories}  leaked {self.texture_leaks}"
+
+    def update_texture_memory(self, categories, leaks):
+        """Track live textures per category as (category, count, bytes) and the leaks found so far"""
+        self.texture_categories = categories
+        self.texture_leaks = leaks
+
+    def update_video_queue(self, depth, underruns, dropped_frames, drift):
+        """Track the video decode queue and how far presentation lags the stream timestamps"""
+        self.video_queue_depth = depth
+        self.video_underruns = underruns
+        self.video_dropped_frames = dropped_frames
+        self.video_drift = drift
+
+    def record_overlay_draw(self, skipped_pixels, unblended_pixels, total_pixels):
+        """Count overlay pixels not drawn at all and pixels copied without blending"""
+        self.overlay_pixels += total_pixels
+        self.overlay_skipped_pixels += skipped_pixels
+        self.overlay_unblended_pixels += unblended_pixels
+
+    def record_video_start(self, latency, preroll_time):
+        """Record how long after the fade the first video frame appeared and how long pre-roll took to decode it"""
+        self.video_start_latency = latency
+        self.video_preroll_time = preroll_time
+
+    def update_buffer_level(self, level, capacity, bursting):
+        self.buffer_level = level
+        self.buffer_capacity = capacity
+        self.buffer_bursting = bursting
+
+    def record_frame_timing(self, late, dropped):
+        """Count a display tick that woke past its deadline and any deadlines skipped before it"""
+        if late:
+            self.late_frames += 1
+        self.dropped_frames += dropped
+
+    def record_decode_time(self, seconds):
+        """Record how long decoding one source frame took"""
+        self.decoded_frames += 1
+        self.total_decode_time += seconds
+        self.last_decode_time = seconds
+
+    def average_decode_time(self):
+        return self.total_decode_time / max(self.decoded_frames, 1)
 
     def update_playback_time(self, current_time):
         """Update playback time if playing"""
@@ -30,14 +128,14 @@ class PlaybackStatistics:
             self.playback_time += (current_time - self.last_playback_start)
             self.last_playback_start = current_time
 
-    def start_playback(self):
+    def start_playback(self, now=None):
         """Start or resume playback"""
         if not self.playing:
-            self.last_playback_start = time.time()
+            self.last_playback_start = time.perf_counter() if now is None else now
             self.playing = True
 
-    def pause_playback(self):
+    def pause_playback(self, now=None):
         """Pause playback and update total time"""
         if self.playing:
-            self.playback_time += time.time() - self.last_playback_start
+            self.playback_time += (time.perf_counter() if now is None else now) - self.last_playback_start
             self.playing = False
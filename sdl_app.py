@@ -3,12 +3,16 @@ import sdl2
 import sdl2.sdlttf
 import ctypes
 from config import Config
+from hud import GlyphAtlas
+from texture_registry import TextureRegistry
 
 class SDLApp:
-    def __init__(self, monitor_index=1):
+    def __init__(self, monitor_index=1, software_renderer=False, texture_registry=None):
         self._init_sdl()
-        self.window, self.renderer = self._create_window_and_renderer(monitor_index)
+        self.window, self.renderer = self._create_window_and_renderer(monitor_index, software_renderer)
+        self.textures = texture_registry or TextureRegistry()
         self.font = self._init_font()
+        self.glyph_atlas = GlyphAtlas(self.renderer, self.font, self.textures) if self.font else None
 
     def _init_sdl(self):
         if sdl2.SDL_Init(sdl2.SDL_INIT_VIDEO) != 0:
@@ -16,7 +20,7 @@ class SDLApp:
         if sdl2.sdlttf.TTF_Init() != 0:
             raise Exception(sdl2.sdlttf.TTF_GetError())
 
-    def _create_window_and_renderer(self, monitor_index):
+    def _create_window_and_renderer(self, monitor_index, software_renderer=False):
         num_displays = sdl2.SDL_GetNumVideoDisplays()
         if monitor_index >= num_displays:
             print(f"Warning: Monitor {monitor_index} not found. Using monitor 0.")
@@ -37,10 +41,11 @@ class SDLApp:
         if not window:
             raise Exception(sdl2.SDL_GetError())
 
-        renderer = sdl2.SDL_CreateRenderer(
-            window, -1,
-            sdl2.SDL_RENDERER_ACCELERATED | sdl2.SDL_RENDERER_PRESENTVSYNC
-        )
+        if software_renderer:
+            flags = sdl2.SDL_RENDERER_SOFTWARE
+        else:
+            flags = sdl2.SDL_RENDERER_ACCELERATED | sdl2.SDL_RENDERER_PRESENTVSYNC
+        renderer = sdl2.SDL_CreateRenderer(window, -1, flags)
 
         if not renderer:
             raise Exception(sdl2.SDL_GetError())
@@ -64,37 +69,9 @@ class SDLApp:
                     return font
         return None
 
-    def render_text(self, text, x, y, color=(255, 255, 255)):
-        if not self.font:
-            return None
-
-        text_surface = sdl2.sdlttf.TTF_RenderText_Blended(
-            self.font,
-            text.encode(),
-            sdl2.SDL_Color(color[0], color[1], color[2], 255)
-        )
-
-        if not text_surface:
-            return None
-
-        text_texture = sdl2.SDL_CreateTextureFromSurface(self.renderer, text_surface)
-
-        if not text_texture:
-            sdl2.SDL_FreeSurface(text_surface)
-            return None
-
-        w = ctypes.c_int()
-        h = ctypes.c_int()
-        sdl2.SDL_QueryTexture(text_texture, None, None, ctypes.byref(w), ctypes.byref(h))
-
-        text_rect = sdl2.SDL_Rect(x, y, w.value, h.value)
-
-        sdl2.SDL_RenderCopy(self.renderer, text_texture, None, text_rect)
-
-        sdl2.SDL_FreeSurface(text_surface)
-        sdl2.SDL_DestroyTexture(text_texture)
-
     def __del__(self):
+        if hasattr(self, 'glyph_atlas') and self.glyph_atlas:
+            self.glyph_atlas.destroy()
         if hasattr(self, 'font') and self.font:
             sdl2.sdlttf.TTF_CloseFont(self.font)
         if hasattr(self, 'renderer') and self.renderer:
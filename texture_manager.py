@@ -1,100 +1,207 @@
-import os
 import sys
 import ctypes
 import sdl2
-from PIL import Image
+from collections import deque, OrderedDict
+from texture_registry import TextureRegistry, texture_bytes
 
 class TextureManager:
-    def __init__(self, renderer):
+    def __init__(self, renderer, pool_limit_bytes=256 * 1024 * 1024, registry=None):
         self.renderer = renderer
+        self.registry = registry or TextureRegistry()
+        self.frame_size = None
+        self.frame_ring = []
+        self.free_frames = deque()
+
+        # Pooled textures: idle ones in LRU order, in-use ones by address
+        self.pool_limit_bytes = pool_limit_bytes
+        self.idle_textures = OrderedDict()  # address -> (key, texture, blend_mode)
+        self.pooled_in_use = {}  # address -> (key, blend_mode)
+        self.pool_hits = 0
+        self.pool_misses = 0
+        self.pool_evictions = 0
+        self.pool_idle_bytes = 0
+        self.pool_in_use_bytes = 0
+
+    def texture_from_image(self, image, category='image'):
+        """Create a static texture from a prepared PIL image (RGB or RGBA) on the render thread"""
+        # Create SDL surface
+        has_alpha = image.mode == 'RGBA'
+        depth = 32 if has_alpha else 24
+        rmask, gmask, bmask, amask = self._rgba_masks()
+
+        surface = sdl2.SDL_CreateRGBSurface(
+            0, image.width, image.height, depth,
+            rmask, gmask, bmask, amask if has_alpha else 0
+        )
 
-    def load_image(self, path, size, keep_aspect=True):
-        if not os.path.exists(path):
-            print(f"File not found: {path}")
+        if not surface:
+            print(f"Failed to create surface: {sdl2.SDL_GetError()}")
             return None
 
-        try:
-            # Load and process image with PIL
-            image = Image.open(path)
-            image = image.convert('RGBA' if path.endswith('.png') else 'RGB')
-
-            if keep_aspect:
-                img_ratio = image.width / image.height
-                target_ratio = size[0] / size[1]
-
-                if img_ratio > target_ratio:
-                    new_width = size[0]
-                    new_height = int(size[0] / img_ratio)
-                else:
-                    new_height = size[1]
-                    new_width = int(size[1] * img_ratio)
-
-                image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-                new_img = Image.new(
-                    'RGBA' if path.endswith('.png') else 'RGB', 
-                    size, 
-                    (0, 0, 0, 0 if path.endswith('.png') else 255)
-                )
-                paste_x = (size[0] - new_width) // 2
-                paste_y = (size[1] - new_height) // 2
-                new_img.paste(image, (paste_x, paste_y))
-                image = new_img
-            else:
-                image = image.resize(size, Image.Resampling.LANCZOS)
-
-            # Create SDL surface
-            has_alpha = path.endswith('.png')
-            depth = 32 if has_alpha else 24
-            rmask = gmask = bmask = amask = 0
-
-            if sys.byteorder == 'little':
-                rmask, gmask, bmask, amask = 0x000000FF, 0x0000FF00, 0x00FF0000, 0xFF000000
-            else:
-                rmask, gmask, bmask, amask = 0xFF000000, 0x00FF0000, 0x0000FF00, 0x000000FF
-
-            surface = sdl2.SDL_CreateRGBSurface(
-                0, image.width, image.height, depth,
-                rmask, gmask, bmask, amask if has_alpha else 0
-            )
-
-            if not surface:
-                print(f"Failed to create surface: {sdl2.SDL_GetError()}")
-                return None
-
-            # Copy pixel data
-            pixels = image.tobytes()
-            sdl2.SDL_LockSurface(surface)
-            ctypes.memmove(surface.contents.pixels, pixels, len(pixels))
-            sdl2.SDL_UnlockSurface(surface)
+        # Copy pixel data
+        pixels = image.tobytes()
+        sdl2.SDL_LockSurface(surface)
+        ctypes.memmove(surface.contents.pixels, pixels, len(pixels))
+        sdl2.SDL_UnlockSurface(surface)
 
-            # Create texture from surface
-            texture = sdl2.SDL_CreateTextureFromSurface(self.renderer, surface)
-
-            # Free surface
-            sdl2.SDL_FreeSurface(surface)
-
-            if not texture:
-                print(f"Failed to create texture: {sdl2.SDL_GetError()}")
-                return None
+        # Create texture from surface
+        texture = self.registry.create_from_surface(self.renderer, surface, category)
 
-            return texture
+        # Free surface
+        sdl2.SDL_FreeSurface(surface)
 
-        except Exception as e:
-            print(f"Error loading image {path}: {e}")
+        if not texture:
+            print(f"Failed to create texture: {sdl2.SDL_GetError()}")
             return None
 
-    def create_texture_from_surface(self, surface, is_overlay=False):
-        if not surface:
-            return None
+        return texture
 
-        texture = sdl2.SDL_CreateTextureFromSurface(self.renderer, surface)
+    def create_frame_ring(self, size, count):
+        """Allocate a fixed ring of streaming textures that source frames are uploaded into"""
+        self.frame_size = size
+        for _ in range(count):
+            texture = self._create_frame_texture()
+            if texture:
+                self.frame_ring.append(texture)
+                self.free_frames.append(texture)
+
+    def _create_frame_texture(self):
+        texture = self.registry.create(
+            self.renderer,
+            sdl2.SDL_PIXELFORMAT_RGBA32,
+            sdl2.SDL_TEXTUREACCESS_STREAMING,
+            self.frame_size[0],
+            self.frame_size[1],
+            'frame'
+        )
         if not texture:
-            print(f"Failed to create texture from surface: {sdl2.SDL_GetError()}")
+            print(f"Failed to create frame texture: {sdl2.SDL_GetError()}")
+        return texture
+
+    def upload_frame(self, pixels):
+        """Copy an RGBA (height, width, 4) array into the next free ring texture, in use until release_frame"""
+        if not self.free_frames:
+            texture = self._create_frame_texture()
+            if not texture:
+                return None
+            self.frame_ring.append(texture)
+            print(f"Frame texture ring exhausted, grown to {len(self.frame_ring)}")
+        else:
+            texture = self.free_frames.popleft()
+
+        if sdl2.SDL_UpdateTexture(texture, None, pixels.ctypes.data, pixels.strides[0]) != 0:
+            print(f"Failed to upload frame: {sdl2.SDL_GetError()}")
+            self.free_frames.append(texture)
             return None
 
-        if texture and is_overlay:
-            sdl2.SDL_SetTextureBlendMode(texture, sdl2.SDL_BLENDMODE_BLEND)
-            sdl2.SDL_SetTextureAlphaMod(texture, 255)
+        return texture
 
+    def release_frame(self, texture):
+        """Return a ring texture so it can receive a later frame"""
+        if not texture:
+            return
+        address = ctypes.addressof(texture.contents)
+        if any(ctypes.addressof(free.contents) == address for free in self.free_frames):
+            return
+        sdl2.SDL_SetTextureAlphaMod(texture, 255)
+        sdl2.SDL_SetTextureBlendMode(texture, sdl2.SDL_BLENDMODE_NONE)
+        self.free_frames.append(texture)
+
+    def destroy_frame_ring(self):
+        for texture in self.frame_ring:
+            self.registry.destroy(texture)
+        self.frame_ring = []
+        self.free_frames.clear()
+
+    def acquire_texture(self, width, height,
+                        pixel_format=sdl2.SDL_PIXELFORMAT_RGBA8888,
+                        access=sdl2.SDL_TEXTUREACCESS_TARGET,
+                        category='texture'):
+        """Get a texture of the given size, format and access mode, reusing an idle one if possible"""
+        # Reused contents are undefined; category counts it in the registry until release_texture
+        key = (width, height, pixel_format, access)
+        for address, (idle_key, texture, blend_mode) in reversed(self.idle_textures.items()):
+            if idle_key == key:
+                del self.idle_textures[address]
+                self.pool_idle_bytes -= self._texture_bytes(key)
+                self.pool_hits += 1
+                self.registry.assign(texture, category)
+                break
+        else:
+            texture = self.registry.create(self.renderer, pixel_format, access, width, height, category)
+            if not texture:
+                print(f"Failed to create texture: {sdl2.SDL_GetError()}")
+                return None
+            self.pool_misses += 1
+            mode = ctypes.c_int()
+            sdl2.SDL_GetTextureBlendMode(texture, ctypes.byref(mode))
+            blend_mode = mode.value
+            address = ctypes.addressof(texture.contents)
+
+        self.pooled_in_use[address] = (key, blend_mode)
+        self.pool_in_use_bytes += self._texture_bytes(key)
         return texture
+
+    def release_texture(self, texture):
+        """Return a texture from acquire_texture to the pool, evicting the least recently used if over the limit"""
+        if not texture:
+            return
+        address = ctypes.addressof(texture.contents)
+        entry = self.pooled_in_use.pop(address, None)
+        if entry is None:
+            self.registry.destroy(texture)
+            return
+
+        key, blend_mode = entry
+        size = self._texture_bytes(key)
+        self.pool_in_use_bytes -= size
+
+        sdl2.SDL_SetTextureBlendMode(texture, blend_mode)
+        sdl2.SDL_SetTextureAlphaMod(texture, 255)
+        sdl2.SDL_SetTextureColorMod(texture, 255, 255, 255)
+        self.idle_textures[address] = (key, texture, blend_mode)
+        self.pool_idle_bytes += size
+        self.registry.assign(texture, 'pool')
+
+        while self.pool_idle_bytes > self.pool_limit_bytes and self.idle_textures:
+            _, (old_key, old_texture, _) = self.idle_textures.popitem(last=False)
+            self.pool_idle_bytes -= self._texture_bytes(old_key)
+            self.pool_evictions += 1
+            self.registry.destroy(old_texture)
+
+    def pool_stats(self):
+        return {
+            'hits': self.pool_hits,
+            'misses': self.pool_misses,
+            'evictions': self.pool_evictions,
+            'idle_bytes': self.pool_idle_bytes,
+            'in_use_bytes': self.pool_in_use_bytes,
+        }
+
+    def format_pool_stats(self):
+        stats = self.pool_stats()
+        requests = stats['hits'] + stats['misses']
+        hit_rate = stats['hits'] / requests * 100 if requests else 0
+        return (
+            f"{stats['hits']} hits / {stats['misses']} misses ({hit_rate:.0f}%), {stats['evictions']} evicted | "
+            f"{stats['in_use_bytes'] / 1024 ** 2:.0f} MB in use, {stats['idle_bytes'] / 1024 ** 2:.0f} MB idle"
+        )
+
+    def destroy_pool(self):
+        for _, texture, _ in self.idle_textures.values():
+            self.registry.destroy(texture)
+        self.idle_textures.clear()
+        self.pool_idle_bytes = 0
+
+    def destroy_texture(self, texture):
+        """Destroy a texture that did not come from acquire_texture"""
+        self.registry.destroy(texture)
+
+    def _texture_bytes(self, key):
+        width, height, pixel_format, _ = key
+        return texture_bytes(width, height, pixel_format)
+
+    def _rgba_masks(self):
+        if sys.byteorder == 'little':
+            return 0x000000FF, 0x0000FF00, 0x00FF0000, 0xFF000000
+        return 0xFF000000, 0x00FF0000, 0x0000FF00, 0x000000FF
@@ -0,0 +1,165 @@
+import ctypes
+import os
+import sys
+import traceback
+from collections import defaultdict
+import sdl2
+
+# Categories whose textures may live as long as the application; all others belong to one sequence
+PERSISTENT_CATEGORIES = ('frame', 'overlay', 'compositor', 'hud', 'pool')
+
+# Frames in these files are skipped when looking for the code that asked for a texture
+_ALLOCATOR_FILES = ('texture_registry.py', 'texture_manager.py')
+
+def texture_bytes(width, height, pixel_format):
+    """Approximate video memory taken by a texture"""
+    if pixel_format in (sdl2.SDL_PIXELFORMAT_IYUV, sdl2.SDL_PIXELFORMAT_YV12):
+        return width * height * 3 // 2
+    return width * height * sdl2.SDL_BYTESPERPIXEL(pixel_format)
+
+class TextureRecord:
+    __slots__ = ('category', 'width', 'height', 'pixel_format', 'bytes', 'site', 'stack', 'generation')
+
+    def __init__(self, category, width, height, pixel_format, site, stack, generation):
+        self.category = category
+        self.width = width
+        self.height = height
+        self.pixel_format = pixel_format
+        self.bytes = texture_bytes(width, height, pixel_format)
+        self.site = site
+        self.stack = stack
+        self.generation = generation
+
+class TextureRegistry:
+    """Every live SDL texture with its size, format, category and creation site"""
+    def __init__(self, debug=False):
+        self.debug = debug
+        self.records = {}  # texture address -> TextureRecord
+        self.live_counts = defaultdict(int)
+        self.live_bytes = defaultdict(int)
+        self.created = 0
+        self.destroyed = 0
+        self.leaked = 0
+        self.generation = 0  # sequence boundaries passed
+        self.reported = set()  # addresses already reported as leaks
+
+    def create(self, renderer, pixel_format, access, width, height, category):
+        texture = sdl2.SDL_CreateTexture(renderer, pixel_format, access, width, height)
+        if texture:
+            self._track(texture, category)
+        return texture
+
+    def create_from_surface(self, renderer, surface, category):
+        texture = sdl2.SDL_CreateTextureFromSurface(renderer, surface)
+        if texture:
+            self._track(texture, category)
+        return texture
+
+    def _track(self, texture, category):
+        pixel_format = ctypes.c_uint32()
+        width = ctypes.c_int()
+        height = ctypes.c_int()
+        sdl2.SDL_QueryTexture(texture, ctypes.byref(pixel_format), None, ctypes.byref(width), ctypes.byref(height))
+
+        site, stack = self._creation_site()
+        record = TextureRecord(category, width.value, height.value, pixel_format.value, site, stack, self.generation)
+        self.records[ctypes.addressof(texture.contents)] = record
+        self.live_counts[category] += 1
+        self.live_bytes[category] += record.bytes
+        self.created += 1
+
+    def _creation_site(self):
+        frame = sys._getframe(1)
+        while frame and os.path.basename(frame.f_code.co_filename) in _ALLOCATOR_FILES:
+            frame = frame.f_back
+        if frame is None:
+            return '?', None
+        # Only the calling line unless debug keeps the full stack for the leak report
+        site = f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        return site, traceback.format_stack(frame) if self.debug else None
+
+    def assign(self, texture, category):
+        """Hand an existing texture to a new owner, e.g. when the pool reuses it"""
+        address = ctypes.addressof(texture.contents)
+        record = self.records.get(address)
+        if record is None:
+            return
+        self.live_counts[record.category] -= 1
+        self.live_bytes[record.category] -= record.bytes
+        record.category = category
+        record.site, record.stack = self._creation_site()
+        record.generation = self.generation
+        self.live_counts[category] += 1
+        self.live_bytes[category] += record.bytes
+        self.reported.discard(address)
+
+    def destroy(self, texture):
+        if not texture:
+            return
+        address = ctypes.addressof(texture.contents)
+        record = self.records.pop(address, None)
+        if record:
+            self.live_counts[record.category] -= 1
+            self.live_bytes[record.category] -= record.bytes
+            self.reported.discard(address)
+            self.destroyed += 1
+        sdl2.SDL_DestroyTexture(texture)
+
+    def total_bytes(self):
+        return sum(self.live_bytes.values())
+
+    def category_stats(self):
+        """(category, live count, live bytes) for every category with live textures, largest first"""
+        # Copied first, as the metrics endpoint reads this from another thread
+        stats = [
+            (category, count, self.live_bytes[category]) for category, count in list(self.live_counts.items()) if count
+        ]
+        return sorted(stats, key=lambda entry: entry[2], reverse=True)
+
+    def snapshot(self):
+        """Live textures per category and lifetime counters as a plain dict, e.g. for JSON metrics"""
+        return {
+            'live_bytes': self.total_bytes(),
+            'categories': {
+                category: {'count': count, 'bytes': nbytes} for category, count, nbytes in self.category_stats()
+            },
+            'created': self.created,
+            'destroyed': self.destroyed,
+            'leaked': self.leaked,
+        }
+
+    def format_stats(self):
+        categories = ", ".join(
+            f"{category} {count} ({nbytes / 1024 ** 2:.0f} MB)" for category, count, nbytes in self.category_stats()
+        )
+        return (
+            f"{self.total_bytes() / 1024 ** 2:.0f} MB live: {categories or 'none'} | "
+            f"{self.created} created, {self.destroyed} destroyed, {self.leaked} leaked"
+        )
+
+    def check_leaks(self):
+        """Pass a sequence boundary and return the newly leaked records"""
+        self.generation += 1
+        leaks = []
+        for address, record in self.records.items():
+            if record.category in PERSISTENT_CATEGORIES or address in self.reported:
+                continue
+            # Alive a full sequence after it was created
+            if record.generation < self.generation - 1:
+                self.reported.add(address)
+                leaks.append(record)
+        self.leaked += len(leaks)
+        return leaks
+
+    def live_records(self, exclude=()):
+        return [record for record in self.records.values() if record.category not in exclude]
+
+    def format_record(self, record):
+        lines = [
+            f"{record.category} texture {record.width}x{record.height} "
+            f"{sdl2.SDL_GetPixelFormatName(record.pixel_format).decode()} "
+            f"({record.bytes / 1024 ** 2:.1f} MB) created at {record.site}"
+        ]
+        if record.stack:
+            lines.append("".join(record.stack).rstrip())
+        return "\n".join(lines)
@@ -1,53 +1,217 @@
+import ctypes
+import time
 import av
 import sdl2
-from texture_manager import TextureManager
+from threading import Thread, Event
+from queue import Queue, Empty, Full
+
+END_OF_STREAM = object()
 
 class VideoPlayer:
     """Handles video playback"""
-    def __init__(self, video_path, renderer):
+    # Uploaded as IYUV so the GPU converts colour; other formats are converted to RGBA on the decode thread
+    YUV_FORMATS = ('yuv420p',)
+
+    def __init__(self, video_path, renderer, texture_manager, queue_size=8):
         self.video_path = video_path
         self.renderer = renderer
+        self.texture_manager = texture_manager
         self.texture = None
+        self.texture_format = None
         self.video_finished = False
+        self.frame_queue = Queue(maxsize=queue_size)
+        self.stop_event = Event()
+        self.decode_thread = None
+        self.frames_shown = 0
+        self.underruns = 0
+        self.dropped_frames = 0
+        self.drift = 0.0
+        self.clock_origin = None  # monotonic time at which pts 0 is due
+        self.frame_duration = 1.0 / 25  # replaced by the stream's frame rate once it is open
+        self.shown_pts = None  # timestamp of the frame on screen
+        self.underrun_pts = None  # shown_pts when the last underrun was counted
+        self.last_decode_time = 0.0  # seconds the shown frame took to decode
+        self.last_upload_time = 0.0  # seconds the shown frame took to upload
+        self.next_item = None
+        self.container = None
+        self.created_time = time.perf_counter()
+        self.first_decode_time = None  # seconds from creation until the first frame was decoded
         self._init_video()
 
     def _init_video(self):
+        # The container is opened on the decode thread too, so a player created early pre-rolls its queue
+        self.decode_thread = Thread(target=self._decode_loop, daemon=True)
+        self.decode_thread.start()
+
+    def _open(self):
         try:
             self.container = av.open(self.video_path)
-            self.stream = self.container.streams.video[0]
-            self.stream.thread_type = 'AUTO'
-            self.frame_iterator = self.container.decode(video=0)
+            stream = self.container.streams.video[0]
+            stream.thread_type = 'AUTO'
+            return stream
         except Exception as e:
             print(f"Error initializing video player: {e}")
-            raise
+            return None
 
-    def get_next_frame_texture(self):
+    def _decode_loop(self):
+        stream = self._open()
+        if stream is None:
+            self._put(END_OF_STREAM)
+            return
+
+        frame_duration = 1.0 / float(stream.average_rate or 25)
+        self.frame_duration = frame_duration
+        pts = 0.0
+        decode_start = time.perf_counter()
         try:
-            frame = next(self.frame_iterator)
-            img = frame.to_ndarray(format='rgba')
-
-            surface = sdl2.SDL_CreateRGBSurfaceFrom(
-                img.ctypes.data, 
-                frame.width, 
-                frame.height, 
-                32, 
-                frame.width * 4,
-                0x000000FF, 
-                0x0000FF00, 
-                0x00FF0000, 
-                0xFF000000
+            for frame in self.container.decode(stream):
+                if self.stop_event.is_set():
+                    return
+                pts = frame.time if frame.time is not None else pts + frame_duration
+                # Decoded frames own their planes, so a YUV frame is queued as is
+                if frame.format.name in self.YUV_FORMATS:
+                    item = frame
+                else:
+                    item = frame.to_ndarray(format='rgba')
+                decoded = time.perf_counter()
+                if self.first_decode_time is None:
+                    self.first_decode_time = decoded - self.created_time
+                if not self._put((pts, item, decoded - decode_start)):
+                    return
+                decode_start = time.perf_counter()
+        except Exception as e:
+            print(f"Error decoding video {self.video_path}: {e}")
+        self._put(END_OF_STREAM)
+
+    def _put(self, item):
+        while not self.stop_event.is_set():
+            try:
+                self.frame_queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def update(self, now, wait=None):
+        """Show the frame due at monotonic time now, returning True if a new frame was uploaded"""
+        due = None
+        while True:
+            if self.next_item is None:
+                try:
+                    # On a simulated clock, wait for the decoder rather than hold a frame for being slow
+                    if wait:
+                        self.next_item = self.frame_queue.get(timeout=wait)
+                    else:
+                        self.next_item = self.frame_queue.get_nowait()
+                except Empty:
+                    if due is None and self._next_frame_overdue(now):
+                        self.underruns += 1
+                        self.underrun_pts = self.shown_pts
+                    break
+
+            if self.next_item is END_OF_STREAM:
+                if due is None:
+                    self.video_finished = True
+                break
+
+            # Hold the current frame until the next is due; of several due frames show the latest
+            pts = self.next_item[0]
+            if self.clock_origin is not None and pts > now - self.clock_origin:
+                break
+
+            if due is not None:
+                self.dropped_frames += 1
+            due = self.next_item
+            self.next_item = None
+
+            # The playback clock starts with the first frame shown
+            if self.clock_origin is None:
+                self.clock_origin = now - pts
+                break
+
+        if due is None:
+            return False
+
+        pts, item, decode_time = due
+        start = time.perf_counter()
+        if isinstance(item, av.VideoFrame):
+            uploaded = self._upload_yuv(item)
+        else:
+            uploaded = self._upload_rgba(item)
+
+        if uploaded:
+            self.last_decode_time = decode_time
+            self.last_upload_time = time.perf_counter() - start
+            self.frames_shown += 1
+            self.shown_pts = pts
+            self.drift = (now - self.clock_origin) - pts
+        return uploaded
+
+    def _next_frame_overdue(self, now):
+        """True if the frame after the one on screen is due and this stall was not counted yet"""
+        if self.shown_pts is None or self.underrun_pts == self.shown_pts:
+            return False
+        return now - self.clock_origin >= self.shown_pts + self.frame_duration
+
+    def _ensure_texture(self, width, height, pixel_format):
+        if self.texture is not None and self.texture_format != pixel_format:
+            self.texture_manager.release_texture(self.texture)
+            self.texture = None
+
+        if self.texture is None:
+            self.texture = self.texture_manager.acquire_texture(
+                width,
+                height,
+                pixel_format,
+                sdl2.SDL_TEXTUREACCESS_STREAMING,
+                'video'
             )
+            self.texture_format = pixel_format
 
-            if not surface:
-                return None
+        return self.texture
 
-            texture = TextureManager(self.renderer).create_texture_from_surface(surface)
-            sdl2.SDL_FreeSurface(surface)
-            return texture
+    def _upload_rgba(self, img):
+        height, width = img.shape[:2]
+        if not self._ensure_texture(width, height, sdl2.SDL_PIXELFORMAT_RGBA32):
+            return False
 
-        except StopIteration:
-            self.video_finished = True
-            return None
-        except Exception as e:
-            print(f"Error in get_next_frame_texture: {e}")
-            return None
+        if sdl2.SDL_UpdateTexture(self.texture, None, img.ctypes.data, img.strides[0]) != 0:
+            print(f"Failed to upload video frame: {sdl2.SDL_GetError()}")
+            return False
+        return True
+
+    def _upload_yuv(self, frame):
+        if not self._ensure_texture(frame.width, frame.height, sdl2.SDL_PIXELFORMAT_IYUV):
+            return False
+
+        y, u, v = frame.planes[:3]
+        if sdl2.SDL_UpdateYUVTexture(
+            self.texture,
+            None,
+            self._plane_pointer(y), y.line_size,
+            self._plane_pointer(u), u.line_size,
+            self._plane_pointer(v), v.line_size
+        ) != 0:
+            print(f"Failed to upload video frame: {sdl2.SDL_GetError()}")
+            return False
+        return True
+
+    def _plane_pointer(self, plane):
+        return ctypes.cast(plane.buffer_ptr, ctypes.POINTER(ctypes.c_uint8))
+
+    def queue_depth(self):
+        return self.frame_queue.qsize()
+
+    def close(self):
+        """Stop decoding and give the texture back to the texture manager"""
+        self.video_finished = True
+        self.stop_event.set()
+        if self.decode_thread:
+            self.decode_thread.join()
+            self.decode_thread = None
+        if self.container:
+            self.container.close()
+            self.container = None
+        if self.texture:
+            self.texture_manager.release_texture(self.texture)
+            self.texture = None